@@ -41,6 +41,12 @@ class BaseAgent(ABC):
         self.llm_client = llm_client or get_claude_client()
         self.role = role
 
+        # Cache of formatted schema blocks keyed by table set (prompt prefix reuse)
+        self._schema_context_cache: Dict[tuple, str] = {}
+
+        # Validation results for DDL validated while a response streamed in
+        self._ddl_validation_cache: Dict[str, Dict[str, Any]] = {}
+
         # Initialize components
         self.view_executor = ViewExecutor(self.db)
         self.catalog = ViewCatalog(self.db)
@@ -127,9 +133,16 @@ class BaseAgent(ABC):
         Returns:
             Formatted schema description
         """
+        # Sort for a stable, order-invariant block and cache the result so
+        # repeated calls produce a byte-identical prompt prefix
+        cache_key = tuple(sorted(tables))
+        cached = self._schema_context_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         schema_parts = []
 
-        for table in tables:
+        for table in cache_key:
             if not self.db.table_exists(table):
                 continue
 
@@ -155,7 +168,9 @@ class BaseAgent(ABC):
 
             schema_parts.append("")  # Blank line
 
-        return "\n".join(schema_parts)
+        schema_context = "\n".join(schema_parts)
+        self._schema_context_cache[cache_key] = schema_context
+        return schema_context
 
     def call_llm(
         self,
@@ -189,6 +204,62 @@ class BaseAgent(ABC):
 
         return response['content']
 
+    def call_llm_streaming(
+        self,
+        user_message: str,
+        system_prompt: str,
+        context: Optional[str] = None,
+        temperature: float = 0.7,
+        on_progress=None
+    ) -> str:
+        """
+        Make a streaming LLM call, invoking a callback per chunk.
+        Lets callers overlap work (e.g., SQL validation) with generation.
+
+        Args:
+            user_message: User's message
+            system_prompt: System prompt
+            context: Additional context (optional)
+            temperature: Sampling temperature
+            on_progress: Callback invoked with each text chunk (optional)
+
+        Returns:
+            Full LLM response text
+        """
+        messages = self.llm_client.format_messages(
+            user_message=user_message,
+            context=context
+        )
+
+        parts = []
+        for chunk in self.llm_client.streaming_completion(
+            messages=messages,
+            system_prompt=system_prompt,
+            temperature=temperature
+        ):
+            parts.append(chunk)
+            if on_progress:
+                on_progress(chunk)
+
+        return "".join(parts)
+
+    def validate_ddl_cached(self, view_ddl: str) -> Dict[str, Any]:
+        """
+        Validate view DDL, reusing a previous result if this DDL was
+        already validated (e.g., while the LLM response streamed in).
+
+        Args:
+            view_ddl: CREATE VIEW statement
+
+        Returns:
+            Validation result dict
+        """
+        validation = self._ddl_validation_cache.get(view_ddl)
+        if validation is None:
+            validation = self.view_executor.validate_view_ddl(view_ddl)
+            self._ddl_validation_cache[view_ddl] = validation
+        return validation
+
     def extract_sql_from_response(self, response: str) -> Optional[str]:
         """
         Extract SQL query from LLM response.
@@ -241,8 +312,8 @@ class BaseAgent(ABC):
         Returns:
             Dict with result
         """
-        # Validate DDL
-        validation = self.view_executor.validate_view_ddl(view_ddl)
+        # Validate DDL (may already be validated from the streaming path)
+        validation = self.validate_ddl_cached(view_ddl)
 
         if not validation['valid']:
             return {
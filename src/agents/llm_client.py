@@ -90,7 +90,13 @@ class ClaudeClient:
                 }
 
                 if system_prompt:
-                    api_params["system"] = system_prompt
+                    # Mark the (stable) system prompt as cacheable so the
+                    # provider can reuse its KV-cache prefix across calls
+                    api_params["system"] = [{
+                        "type": "text",
+                        "text": system_prompt,
+                        "cache_control": {"type": "ephemeral"}
+                    }]
 
                 # Make API call
                 logger.debug(f"Calling Claude API (attempt {attempt + 1}/{max_retries})...")
@@ -3,14 +3,23 @@ Researcher Agent - Deep analysis and Layer 2 view creation.
 Performs analytical queries and creates research views with complex calculations.
 """
 
+import hashlib
 import logging
 import json
+import re
 from typing import Dict, Any, Optional, List
 
 from .base_agent import BaseAgent
 
 logger = logging.getLogger(__name__)
 
+# Matches completed "sql": "..." values in the streamed JSON plan
+_STREAMED_SQL_RE = re.compile(r'"sql"\s*:\s*("(?:[^"\\]|\\.)*")')
+
+# Similarity above which an existing view is considered a direct answer
+# to the query and the LLM planning call is skipped entirely
+PLAN_REUSE_THRESHOLD = 0.92
+
 
 RESEARCHER_SYSTEM_PROMPT = """You are a Researcher Agent for deep data analysis. Your job is to:
 
@@ -62,6 +71,15 @@ Return a JSON object with:
 """
 
 
+# Hashed once at import: a stable handle for the prompt's identity.
+# Useful as part of cache keys (cached plans are invalidated whenever the
+# prompt text changes) and it guarantees the prompt bytes sent to the
+# provider never vary call-to-call, keeping prefix caches warm.
+RESEARCHER_SYSTEM_PROMPT_HASH = hashlib.sha256(
+    RESEARCHER_SYSTEM_PROMPT.encode('utf-8')
+).hexdigest()
+
+
 class ResearcherAgent(BaseAgent):
     """
     Researcher Agent for deep analysis and Layer 2 view creation.
@@ -107,12 +125,15 @@ class ResearcherAgent(BaseAgent):
             result = self.execute_analytical_query(query_spec)
             query_results.append(result)
 
-        # Step 4: Create Layer 2 research views
+        # Step 4: Create Layer 2 research views (one transaction, one fsync)
         created_views = []
-        for view_spec in research_plan.get('views_to_create', []):
-            result = self.create_research_view(view_spec)
-            if result['success']:
-                created_views.append(result['view'])
+        view_specs = research_plan.get('views_to_create', [])
+        if view_specs:
+            with self.catalog.transaction():
+                for view_spec in view_specs:
+                    result = self.create_research_view(view_spec)
+                    if result['success']:
+                        created_views.append(result['view'])
 
         # Step 5: Generate report with ACTUAL query results
         report = self.generate_findings_report(
@@ -148,11 +169,19 @@ class ResearcherAgent(BaseAgent):
         Returns:
             Dict with research plan
         """
+        # Short-circuit: if an existing view is a near-exact match for the
+        # query, reuse it directly and skip the LLM round trip
+        reuse_plan = self._plan_from_matching_view(query)
+        if reuse_plan:
+            return reuse_plan
+
         # Get available views
         existing_views = explorer_context.get('existing_views', [])
         created_views = explorer_context.get('created_views', [])
 
-        all_views = existing_views + created_views
+        # Sort so the context prefix is byte-identical regardless of the
+        # order views were discovered in (keeps provider prefix caches warm)
+        all_views = sorted(set(existing_views + created_views))
 
         # Build view descriptions
         view_descriptions = []
@@ -171,12 +200,14 @@ class ResearcherAgent(BaseAgent):
         relevant_tables = explorer_context.get('relevant_tables', ['transactions'])
         schema_context = self.format_schema_for_llm(relevant_tables)
 
-        context = f"""Available Views:
-{views_context}
-
-Database Schema:
+        # Stable, large blocks first; the volatile user query last.
+        # Identical prefixes across calls let the provider reuse its KV cache.
+        context = f"""Database Schema:
 {schema_context}
 
+Available Views:
+{views_context}
+
 Explorer's Recommendations:
 {explorer_context.get('recommendations', 'None')}
 
@@ -186,14 +217,29 @@ Task: Plan your research approach. Use existing views when possible.
 Execute analytical queries and create Layer 2 views for complex findings.
 """
 
-        # Call LLM
+        # Call LLM (streaming, so SQL validation overlaps generation)
+        user_message = "Based on the context above, plan your research. Execute queries and recommend Layer 2 views. Return JSON format as specified."
+
+        self._stream_buffer = ""
+        self._streamed_sql_count = 0
+
         try:
-            response = self.call_llm(
-                user_message="Based on the context above, plan your research. Execute queries and recommend Layer 2 views. Return JSON format as specified.",
-                system_prompt=RESEARCHER_SYSTEM_PROMPT,
-                context=context,
-                temperature=0.3
-            )
+            try:
+                response = self.call_llm_streaming(
+                    user_message=user_message,
+                    system_prompt=RESEARCHER_SYSTEM_PROMPT,
+                    context=context,
+                    temperature=0.3,
+                    on_progress=self._prevalidate_streamed_sql
+                )
+            except Exception as e:
+                logger.warning(f"Streaming completion failed ({e}), falling back to blocking call")
+                response = self.call_llm(
+                    user_message=user_message,
+                    system_prompt=RESEARCHER_SYSTEM_PROMPT,
+                    context=context,
+                    temperature=0.3
+                )
 
             # Parse JSON response
             if "```json" in response:
@@ -234,6 +280,76 @@ Execute analytical queries and create Layer 2 views for complex findings.
                 'report': 'Research analysis is available but detailed findings could not be fully extracted due to response format issues. The system identified fraud patterns and recommended analytical views for future investigation.'
             }
 
+    def _plan_from_matching_view(self, query: str) -> Optional[Dict[str, Any]]:
+        """
+        Build a research plan directly from an existing view when its
+        embedding is a near-exact match for the query. Avoids the LLM
+        call for trivial queries already covered by the catalog.
+
+        Args:
+            query: User's query
+
+        Returns:
+            Synthesized plan dict, or None if no view matches closely enough
+        """
+        try:
+            matches = self.semantic_search.search(
+                query,
+                top_k=1,
+                min_score=PLAN_REUSE_THRESHOLD
+            )
+        except Exception as e:
+            logger.warning(f"View-reuse pre-check failed: {e}")
+            return None
+
+        if not matches:
+            logger.debug("No near-exact view match, falling through to LLM planning")
+            return None
+
+        matched = matches[0].view
+        logger.info(
+            f"Reusing view {matched.view_name} for query "
+            f"(score={matches[0].similarity_score:.3f}), skipping LLM planning"
+        )
+
+        return {
+            'analysis': f"Query is directly covered by existing view {matched.view_name}.",
+            'queries_executed': [{
+                'purpose': query,
+                'sql': f"SELECT * FROM {matched.view_name}",
+                'insights': matched.description or ''
+            }],
+            'views_to_create': [],
+            'report': (
+                f"Reused existing view {matched.view_name} "
+                f"({matched.description or 'no description'}). "
+                f"See query results for details."
+            )
+        }
+
+    def _prevalidate_streamed_sql(self, chunk: str) -> None:
+        """
+        Validate SQL statements as they arrive in the streamed plan.
+        Each completed "sql" value is validated immediately so the
+        validation cost overlaps LLM generation instead of following it.
+
+        Args:
+            chunk: Next text chunk from the streaming response
+        """
+        self._stream_buffer += chunk
+
+        matches = _STREAMED_SQL_RE.findall(self._stream_buffer)
+        for encoded_sql in matches[self._streamed_sql_count:]:
+            try:
+                sql = json.loads(encoded_sql)
+            except json.JSONDecodeError:
+                continue
+
+            if sql.upper().lstrip().startswith('CREATE'):
+                self.validate_ddl_cached(sql)
+
+        self._streamed_sql_count = len(matches)
+
     def execute_analytical_query(self, query_spec: Dict[str, Any]) -> Dict[str, Any]:
         """
         Execute an analytical query.
@@ -2,10 +2,19 @@
 Pydantic models for View Catalog metadata.
 """
 
+import hashlib
 import json
 from datetime import datetime
-from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field, field_validator
+from typing import ClassVar, List, Optional, Dict, Any, Tuple
+from pydantic import BaseModel, Field, PrivateAttr, field_validator
+
+# Datetime columns parsed on reads; bound once at module level with a local
+# alias for the C-implemented parser to keep the per-row loop tight
+_DT_FIELDS = (
+    'created_date', 'promoted_date', 'materialized_date',
+    'last_used', 'last_validated', 'approval_date'
+)
+_fromiso = datetime.fromisoformat
 
 
 class ViewMetadata(BaseModel):
@@ -20,11 +29,24 @@ class ViewMetadata(BaseModel):
     domain: str = Field(..., description="Business domain (fraud, compliance, customer, etc.)")
     description: Optional[str] = Field(None, description="Business-level description")
 
-    # Lineage
-    base_tables: List[str] = Field(default_factory=list, description="Base tables used by this view")
-    depends_on_views: List[str] = Field(default_factory=list, description="Views this view depends on")
-    used_by_views: List[str] = Field(default_factory=list, description="Views that depend on this view")
-    steiner_subgraph: Optional[Dict[str, Any]] = Field(None, description="Original Steiner Tree subgraph")
+    # Lineage - lazily decoded JSON columns (see properties below).
+    # Raw JSON strings from the database are kept in private attributes and
+    # only decoded on first access, so list-free workloads skip json.loads.
+    _base_tables_raw: Optional[str] = PrivateAttr(default=None)
+    _depends_on_views_raw: Optional[str] = PrivateAttr(default=None)
+    _used_by_views_raw: Optional[str] = PrivateAttr(default=None)
+    _tags_raw: Optional[str] = PrivateAttr(default=None)
+    _steiner_subgraph_raw: Optional[str] = PrivateAttr(default=None)
+
+    _base_tables: Optional[List[str]] = PrivateAttr(default=None)
+    _depends_on_views: Optional[List[str]] = PrivateAttr(default=None)
+    _used_by_views: Optional[List[str]] = PrivateAttr(default=None)
+    _tags: Optional[List[str]] = PrivateAttr(default=None)
+    _steiner_subgraph: Optional[Dict[str, Any]] = PrivateAttr(default=None)
+
+    _summary: Optional[str] = PrivateAttr(default=None)
+    _semantic_text: Optional[str] = PrivateAttr(default=None)
+    _semantic_hash: Optional[str] = PrivateAttr(default=None)
 
     # Creation context
     created_by_session: Optional[str] = Field(None, description="Session ID that created this view")
@@ -49,7 +71,6 @@ class ViewMetadata(BaseModel):
 
     # Semantic search
     embedding_id: Optional[str] = Field(None, description="Reference to embedding vector")
-    tags: List[str] = Field(default_factory=list, description="Semantic tags for discovery")
 
     # DDL
     view_definition: str = Field(..., description="Full CREATE VIEW statement")
@@ -64,6 +85,58 @@ class ViewMetadata(BaseModel):
             datetime: lambda v: v.isoformat() if v else None
         }
 
+    def __init__(self, **data):
+        # Pull the JSON-backed fields out before Pydantic validation;
+        # they are stored as private attributes and exposed as properties.
+        base_tables = data.pop('base_tables', None)
+        depends_on_views = data.pop('depends_on_views', None)
+        used_by_views = data.pop('used_by_views', None)
+        tags = data.pop('tags', None)
+        steiner_subgraph = data.pop('steiner_subgraph', None)
+
+        super().__init__(**data)
+
+        self._base_tables = list(base_tables) if base_tables else []
+        self._depends_on_views = list(depends_on_views) if depends_on_views else []
+        self._used_by_views = list(used_by_views) if used_by_views else []
+        self._tags = list(tags) if tags else []
+        self._steiner_subgraph = steiner_subgraph
+
+    @property
+    def base_tables(self) -> List[str]:
+        """Base tables used by this view (decoded on first access)."""
+        if self._base_tables is None:
+            self._base_tables = json.loads(self._base_tables_raw or '[]')
+        return self._base_tables
+
+    @property
+    def depends_on_views(self) -> List[str]:
+        """Views this view depends on (decoded on first access)."""
+        if self._depends_on_views is None:
+            self._depends_on_views = json.loads(self._depends_on_views_raw or '[]')
+        return self._depends_on_views
+
+    @property
+    def used_by_views(self) -> List[str]:
+        """Views that depend on this view (decoded on first access)."""
+        if self._used_by_views is None:
+            self._used_by_views = json.loads(self._used_by_views_raw or '[]')
+        return self._used_by_views
+
+    @property
+    def tags(self) -> List[str]:
+        """Semantic tags for discovery (decoded on first access)."""
+        if self._tags is None:
+            self._tags = json.loads(self._tags_raw or '[]')
+        return self._tags
+
+    @property
+    def steiner_subgraph(self) -> Optional[Dict[str, Any]]:
+        """Original Steiner Tree subgraph (decoded on first access)."""
+        if self._steiner_subgraph is None and self._steiner_subgraph_raw:
+            self._steiner_subgraph = json.loads(self._steiner_subgraph_raw)
+        return self._steiner_subgraph
+
     @field_validator('view_name')
     def validate_view_name(cls, v):
         """Ensure view name starts with v_"""
@@ -105,22 +178,20 @@ class ViewMetadata(BaseModel):
     def to_db_dict(self) -> Dict[str, Any]:
         """
         Convert to dictionary for database insertion.
-        Serializes lists and dicts to JSON strings.
+        Lists and dicts are passed through as Python objects; the sqlite3
+        adapters registered in database.connection serialize them to JSON
+        at bind time (raw strings are reused when never decoded).
         """
         data = self.model_dump()
 
-        # Convert lists to JSON
-        data['base_tables'] = json.dumps(data['base_tables'])
-        data['depends_on_views'] = json.dumps(data['depends_on_views'])
-        data['used_by_views'] = json.dumps(data['used_by_views'])
-        data['tags'] = json.dumps(data['tags'])
-
-        # Convert steiner_subgraph to JSON
-        if data['steiner_subgraph']:
-            data['steiner_subgraph'] = json.dumps(data['steiner_subgraph'])
+        data['base_tables'] = self._base_tables_raw if self._base_tables is None else self._base_tables
+        data['depends_on_views'] = self._depends_on_views_raw if self._depends_on_views is None else self._depends_on_views
+        data['used_by_views'] = self._used_by_views_raw if self._used_by_views is None else self._used_by_views
+        data['tags'] = self._tags_raw if self._tags is None else self._tags
+        data['steiner_subgraph'] = self._steiner_subgraph if self._steiner_subgraph is not None else self._steiner_subgraph_raw
 
         # Convert datetimes to strings
-        for key in ['created_date', 'promoted_date', 'materialized_date', 'last_used', 'last_validated', 'approval_date']:
+        for key in _DT_FIELDS:
             if data[key]:
                 data[key] = data[key].isoformat()
 
@@ -129,40 +200,125 @@ class ViewMetadata(BaseModel):
 
         return data
 
+    # JSON-encoded columns that are decoded lazily on reads
+    JSON_FIELDS: ClassVar[Tuple[str, ...]] = (
+        'base_tables', 'depends_on_views', 'used_by_views', 'tags', 'steiner_subgraph'
+    )
+
     @classmethod
-    def from_db_row(cls, row: Dict[str, Any]) -> 'ViewMetadata':
+    def _decode_db_row(cls, row: Any) -> Dict[str, Any]:
         """
-        Create ViewMetadata from database row.
-        Deserializes JSON strings back to lists/dicts.
+        Decode the scalar columns of a database row (timestamps, booleans).
+        Accepts sqlite3.Row or dict; this is the single per-row copy, so
+        callers should pass cursor rows through directly.
+        JSON columns are left as-is for the caller to handle.
         """
         data = dict(row)
 
-        # Parse JSON fields
-        data['base_tables'] = json.loads(data['base_tables']) if data.get('base_tables') else []
-        data['depends_on_views'] = json.loads(data['depends_on_views']) if data.get('depends_on_views') else []
-        data['used_by_views'] = json.loads(data['used_by_views']) if data.get('used_by_views') else []
-        data['tags'] = json.loads(data['tags']) if data.get('tags') else []
+        # Convert string timestamps to datetime
+        get = data.get
+        for key in _DT_FIELDS:
+            value = get(key)
+            if value:
+                data[key] = _fromiso(value)
+
+        # Convert int to bool
+        data['is_valid'] = bool(get('is_valid', 1))
+
+        return data
+
+    @classmethod
+    def from_db_row(cls, row: Dict[str, Any]) -> 'ViewMetadata':
+        """
+        Create ViewMetadata from database row with full validation.
+        Use for rows of external or uncertain origin.
+        """
+        data = cls._decode_db_row(row)
+
+        for key in ('base_tables', 'depends_on_views', 'used_by_views', 'tags'):
+            data[key] = json.loads(data[key]) if data.get(key) else []
 
         if data.get('steiner_subgraph'):
             data['steiner_subgraph'] = json.loads(data['steiner_subgraph'])
 
-        # Convert string timestamps to datetime
-        for key in ['created_date', 'promoted_date', 'materialized_date', 'last_used', 'last_validated', 'approval_date']:
-            if data.get(key):
-                data[key] = datetime.fromisoformat(data[key])
+        return cls(**data)
 
-        # Convert int to bool
-        data['is_valid'] = bool(data.get('is_valid', 1))
+    @classmethod
+    def from_trusted_row(cls, row: Dict[str, Any]) -> 'ViewMetadata':
+        """
+        Create ViewMetadata from a trusted database row, skipping validation.
+        The catalog is the source of truth: every row was validated on the
+        write path, so re-running validators on reads is pure overhead.
+        JSON columns are copied through raw and only decoded on first access.
+        """
+        data = cls._decode_db_row(row)
+        raw = {key: data.pop(key, None) for key in cls.JSON_FIELDS}
+
+        view = cls.model_construct(**data)
+        view._base_tables_raw = raw['base_tables']
+        view._depends_on_views_raw = raw['depends_on_views']
+        view._used_by_views_raw = raw['used_by_views']
+        view._tags_raw = raw['tags']
+        view._steiner_subgraph_raw = raw['steiner_subgraph']
+
+        return view
+
+    def __setattr__(self, name, value):
+        # Invalidate the cached summary when a summarized field changes
+        if name in ('usage_count', 'status'):
+            self._summary = None
+        super().__setattr__(name, value)
+
+    @property
+    def semantic_text(self) -> str:
+        """
+        Composite text embedded for semantic search: a pure function of
+        description, domain, layer, tags, and base tables (built once).
+        """
+        if self._semantic_text is None:
+            text_parts = []
 
-        return cls(**data)
+            if self.description:
+                text_parts.append(self.description)
+
+            text_parts.append(f"domain: {self.domain}")
+
+            layer_name = {1: "discovery", 2: "research", 3: "compound"}
+            text_parts.append(f"layer: {layer_name.get(self.layer, 'unknown')}")
+
+            if self.tags:
+                text_parts.append(f"tags: {', '.join(self.tags)}")
+
+            if self.base_tables:
+                text_parts.append(f"tables: {', '.join(self.base_tables)}")
+
+            self._semantic_text = " | ".join(text_parts)
+        return self._semantic_text
+
+    @property
+    def semantic_hash(self) -> str:
+        """
+        Content hash of semantic_text. Views with identical semantic
+        metadata share a hash, so embedding caches keyed by it dedupe
+        across renames.
+        """
+        if self._semantic_hash is None:
+            self._semantic_hash = hashlib.sha256(
+                self.semantic_text.encode('utf-8')
+            ).hexdigest()
+        return self._semantic_hash
 
     def get_summary(self) -> str:
-        """Get a one-line summary of the view."""
-        return (
-            f"{self.view_name} (L{self.layer}/{self.domain}) - "
-            f"{self.status} - used {self.usage_count} times - "
-            f"{len(self.base_tables)} tables, {len(self.depends_on_views)} dependencies"
-        )
+        """Get a one-line summary of the view (cached after first call)."""
+        if self._summary is None:
+            n_tables = len(self.base_tables)
+            n_deps = len(self.depends_on_views)
+            self._summary = (
+                f"{self.view_name} (L{self.layer}/{self.domain}) - "
+                f"{self.status} - used {self.usage_count} times - "
+                f"{n_tables} tables, {n_deps} dependencies"
+            )
+        return self._summary
 
 
 class ViewSearchResult(BaseModel):
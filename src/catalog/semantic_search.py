@@ -3,9 +3,14 @@ Semantic search for view discovery using sentence-transformers.
 Enables natural language queries to find relevant views in the catalog.
 """
 
+import hashlib
+import heapq
 import logging
+import re
 import numpy as np
-from typing import List, Optional, Dict, Any
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Optional, Dict, Any, Set
 from sentence_transformers import SentenceTransformer
 
 from .models import ViewMetadata, ViewSearchResult
@@ -13,6 +18,29 @@ from .view_catalog import ViewCatalog
 
 logger = logging.getLogger(__name__)
 
+_TOKEN_RE = re.compile(r"[a-z0-9_]+")
+
+
+def _quantize_int8(matrix: np.ndarray):
+    """
+    Quantize embedding rows to int8 with per-row scales.
+
+    Args:
+        matrix: Float embeddings, shape (n, dim)
+
+    Returns:
+        Tuple of (int8 matrix, float32 per-row scales) such that
+        row ~= int8_row * scale
+    """
+    scales = np.abs(matrix).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+
+    quantized = np.clip(
+        np.round(matrix / scales[:, np.newaxis]), -127, 127
+    ).astype(np.int8)
+
+    return np.ascontiguousarray(quantized), scales.astype(np.float32)
+
 
 class SemanticSearch:
     """
@@ -23,7 +51,8 @@ class SemanticSearch:
     def __init__(
         self,
         catalog: ViewCatalog,
-        model_name: str = "all-MiniLM-L6-v2"
+        model_name: str = "all-MiniLM-L6-v2",
+        cache_dir: Optional[str] = None
     ):
         """
         Initialize semantic search engine.
@@ -31,11 +60,44 @@ class SemanticSearch:
         Args:
             catalog: ViewCatalog instance
             model_name: Sentence-transformers model name
+            cache_dir: Directory for the persistent embedding cache
+                (defaults to .cache/embeddings in the project root)
         """
         self.catalog = catalog
         self.model_name = model_name
         self.model = None
+
+        # Values are row views into one contiguous memory-mapped arena
+        # (see _store_embedding) rather than separately-allocated arrays,
+        # so similarity scans walk sequential memory
         self.embeddings_cache: Dict[str, np.ndarray] = {}
+        self._mm: Optional[np.memmap] = None
+        self._mm_rows = 0
+        self._mm_capacity = 0
+        self._name_to_row: Dict[str, int] = {}
+
+        # LRU cache of query-text embeddings: repeated and retried queries
+        # skip the transformer forward pass entirely
+        self._query_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._query_cache_size = 1024
+
+        # Per-view token sets for the lexical pre-filter, keyed by
+        # semantic hash like the embedding caches
+        self._token_cache: Dict[str, Set[str]] = {}
+
+        # Disk-backed cache keyed by content hash; survives restarts so
+        # unchanged views are never re-embedded
+        if cache_dir is None:
+            cache_dir = Path(__file__).parent.parent.parent / ".cache" / "embeddings"
+        self._cache_dir = Path(cache_dir)
+
+        # Stacked embedding matrix for batched similarity (rebuilt lazily).
+        # Stored int8-quantized with per-row scales: similarity scans move
+        # a quarter of the bytes of float32 and use integer dot products.
+        self._embedding_matrix: Optional[np.ndarray] = None
+        self._row_scales: Optional[np.ndarray] = None
+        self._row_index: Dict[str, int] = {}
+        self._matrix_dirty = True
 
         logger.info(f"Semantic search initialized with model: {model_name}")
 
@@ -56,10 +118,44 @@ class SemanticSearch:
         Returns:
             Embedding vector (numpy array)
         """
+        cached = self._query_cache.get(text)
+        if cached is not None:
+            self._query_cache.move_to_end(text)
+            return cached
+
         self._load_model()
         embedding = self.model.encode(text, convert_to_numpy=True)
+
+        self._query_cache[text] = embedding
+        if len(self._query_cache) > self._query_cache_size:
+            self._query_cache.popitem(last=False)
+
         return embedding
 
+    def embed_texts(self, texts: List[str]) -> List[np.ndarray]:
+        """
+        Generate embeddings for several texts, encoding all cache
+        misses in one batched model call instead of one call per text.
+
+        Args:
+            texts: Input texts
+
+        Returns:
+            List of embedding vectors, in input order
+        """
+        misses = [t for t in texts if t not in self._query_cache]
+        if misses:
+            self._load_model()
+            encoded = self.model.encode(misses, batch_size=64, convert_to_numpy=True)
+            for text, embedding in zip(misses, encoded):
+                self._query_cache[text] = embedding
+                if len(self._query_cache) > self._query_cache_size:
+                    self._query_cache.popitem(last=False)
+
+        # embed_text serves each lookup (and re-encodes the rare miss
+        # evicted by a very large batch)
+        return [self.embed_text(text) for text in texts]
+
     def embed_view(self, view: ViewMetadata) -> np.ndarray:
         """
         Generate embedding for a view.
@@ -71,79 +167,321 @@ class SemanticSearch:
         Returns:
             Embedding vector
         """
-        # Check cache first
-        if view.view_name in self.embeddings_cache:
-            return self.embeddings_cache[view.view_name]
+        # Check cache first (keyed by content hash: identical metadata
+        # shares one embedding, and stale entries self-invalidate)
+        cached = self.embeddings_cache.get(view.semantic_hash)
+        if cached is not None:
+            return cached
+
+        # Check disk cache next (survives restarts)
+        cache_key = self._disk_cache_key(view.semantic_text)
+        embedding = self._load_cached_embedding(cache_key)
+
+        if embedding is None:
+            # Generate embedding, stored L2-normalized so cosine similarity
+            # against other unit vectors reduces to a dot product
+            embedding = self.embed_text(view.semantic_text)
+            norm = np.linalg.norm(embedding)
+            if norm > 0:
+                embedding = (embedding / norm).astype(np.float32)
+
+            self._store_cached_embedding(cache_key, embedding)
+
+        # Cache it in the contiguous arena
+        return self._store_embedding(view.semantic_hash, embedding)
+
+    def _store_embedding(self, key: str, embedding: np.ndarray) -> np.ndarray:
+        """
+        Store a view embedding in the contiguous memory-mapped arena and
+        return the row view. Keys are semantic content hashes. Falls back
+        to a plain heap array if the arena file cannot be created.
+        """
+        embedding = np.ascontiguousarray(embedding, dtype=np.float32)
+
+        try:
+            row = self._name_to_row.get(key)
+            if row is None:
+                if self._mm is None:
+                    self._mm_open(dim=embedding.shape[0], capacity=256)
+                elif self._mm_rows == self._mm_capacity:
+                    self._mm_open(dim=self._mm.shape[1], capacity=self._mm_capacity * 2)
+                row = self._mm_rows
+                self._mm_rows += 1
+                self._name_to_row[key] = row
+
+            self._mm[row] = embedding
+            stored = self._mm[row]
+        except OSError as e:
+            logger.warning(f"Embedding arena unavailable, using heap array: {e}")
+            stored = embedding
+
+        self.embeddings_cache[key] = stored
+        self._matrix_dirty = True
+        return stored
+
+    def _mm_open(self, dim: int, capacity: int) -> None:
+        """Create or grow the memory-mapped embedding arena."""
+        self._cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._cache_dir / "embedding_arena.f32"
+
+        if self._mm is None:
+            mm = np.memmap(path, dtype=np.float32, mode='w+', shape=(capacity, dim))
+        else:
+            # Grow in place: extend the file, then re-map with the new shape
+            self._mm.flush()
+            with open(path, 'r+b') as f:
+                f.truncate(capacity * dim * 4)
+            mm = np.memmap(path, dtype=np.float32, mode='r+', shape=(capacity, dim))
+
+        self._mm = mm
+        self._mm_capacity = capacity
+
+        # Re-point cached row views at the new mapping
+        for name, row in self._name_to_row.items():
+            self.embeddings_cache[name] = mm[row]
+
+    def _disk_cache_key(self, composite_text: str) -> str:
+        """Content-hash cache key, invalidated by model or text changes."""
+        return hashlib.sha256(
+            f"{self.model_name}\n{composite_text}".encode('utf-8')
+        ).hexdigest()
+
+    def _load_cached_embedding(self, key: str) -> Optional[np.ndarray]:
+        """Load an embedding from the disk cache, or None on miss."""
+        path = self._cache_dir / f"{key}.npy"
+        if path.exists():
+            try:
+                return np.load(path)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Failed to read cached embedding {key}: {e}")
+        return None
+
+    def _store_cached_embedding(self, key: str, embedding: np.ndarray) -> None:
+        """Persist an embedding to the disk cache (best effort)."""
+        try:
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
+            np.save(self._cache_dir / f"{key}.npy", embedding)
+        except OSError as e:
+            logger.warning(f"Failed to persist embedding {key}: {e}")
+
+    def invalidate_view(self, view_name: str) -> None:
+        """
+        Retained for API compatibility: embeddings are keyed by each
+        view's semantic content hash, so a metadata change produces a new
+        key and the stale entry simply stops being referenced.
+        """
 
-        # Build composite text for embedding
-        text_parts = []
+    def index_all_views(self) -> int:
+        """
+        Index all views in the catalog by generating embeddings.
+        Texts are encoded in a single batched forward pass, amortizing
+        tokenization and kernel-launch overhead across views.
 
-        if view.description:
-            text_parts.append(view.description)
+        Returns:
+            Number of views indexed
+        """
+        logger.info("Indexing all views in catalog...")
 
-        # Add domain context
-        text_parts.append(f"domain: {view.domain}")
+        views = [
+            view for view in self.catalog.iter_all_views()
+            if view.semantic_hash not in self.embeddings_cache
+        ]
 
-        # Add layer context
-        layer_name = {1: "discovery", 2: "research", 3: "compound"}
-        text_parts.append(f"layer: {layer_name.get(view.layer, 'unknown')}")
+        if not views:
+            logger.info("All views already indexed")
+            return 0
 
-        # Add tags
-        if view.tags:
-            text_parts.append(f"tags: {', '.join(view.tags)}")
+        # Warm from the disk cache; only cache misses hit the model
+        texts = [view.semantic_text for view in views]
+        keys = [self._disk_cache_key(text) for text in texts]
 
-        # Add base tables for context
-        if view.base_tables:
-            text_parts.append(f"tables: {', '.join(view.base_tables)}")
+        missing = []
+        for i, (view, key) in enumerate(zip(views, keys)):
+            cached = self._load_cached_embedding(key)
+            if cached is not None:
+                self._store_embedding(view.semantic_hash, cached)
+            else:
+                missing.append(i)
 
-        composite_text = " | ".join(text_parts)
+        if missing:
+            self._load_model()
+            embeddings = self.model.encode(
+                [texts[i] for i in missing],
+                batch_size=64,
+                show_progress_bar=False,
+                convert_to_numpy=True,
+                normalize_embeddings=True
+            )
 
-        # Generate embedding
-        embedding = self.embed_text(composite_text)
+            for i, embedding in zip(missing, embeddings):
+                embedding = embedding.astype(np.float32)
+                self._store_embedding(views[i].semantic_hash, embedding)
+                self._store_cached_embedding(keys[i], embedding)
 
-        # Cache it
-        self.embeddings_cache[view.view_name] = embedding
+        self._matrix_dirty = True
 
-        return embedding
+        logger.info(f"Indexed {len(views)} views ({len(missing)} embedded, {len(views) - len(missing)} from disk cache)")
+        return len(views)
 
-    def index_all_views(self) -> int:
+    def _ensure_matrix(self) -> None:
         """
-        Index all views in the catalog by generating embeddings.
+        Rebuild the stacked (N, D) embedding matrix from the cache if any
+        embeddings were added since the last build.
+        """
+        if not self._matrix_dirty:
+            return
+
+        names = list(self.embeddings_cache.keys())
+        self._row_index = {name: i for i, name in enumerate(names)}
+
+        if names:
+            # Rows are unit vectors (normalized in embed_view); quantize
+            # each to int8 with a per-row scale for the scan path
+            matrix = np.vstack([self.embeddings_cache[name] for name in names])
+            quantized, scales = _quantize_int8(matrix)
+            self._embedding_matrix = quantized
+            self._row_scales = scales
+        else:
+            self._embedding_matrix = None
+            self._row_scales = None
+
+        self._matrix_dirty = False
+
+    def _score_candidates(
+        self,
+        query_embedding: np.ndarray,
+        candidates: List[ViewMetadata]
+    ) -> np.ndarray:
+        """
+        Score candidates against a query embedding in one matrix-vector
+        product instead of per-candidate cosine calls.
+
+        Args:
+            query_embedding: Query vector
+            candidates: Candidate views (embedded on demand)
 
         Returns:
-            Number of views indexed
+            Similarity scores aligned with candidates
         """
-        logger.info("Indexing all views in catalog...")
+        # Make sure every candidate has a cached embedding
+        for view in candidates:
+            if view.semantic_hash not in self.embeddings_cache:
+                self.embed_view(view)
+
+        self._ensure_matrix()
+
+        idx = np.array([self._row_index[v.semantic_hash] for v in candidates])
+        sub = self._embedding_matrix[idx]
+
+        # Unit rows x unit query: cosine is just the dot product.
+        # Both sides are int8-quantized; the integer matmul accumulates
+        # into int32 and the per-row/query scales restore magnitudes.
+        query_unit = query_embedding / (np.linalg.norm(query_embedding) + 1e-12)
+        query_scale = np.abs(query_unit).max() / 127.0
+        if query_scale == 0:
+            query_scale = 1.0
+        query_q8 = np.clip(
+            np.round(query_unit / query_scale), -127, 127
+        ).astype(np.int32)
+
+        int_scores = sub.astype(np.int32) @ query_q8
+        scores = int_scores * (self._row_scales[idx] * np.float32(query_scale))
+
+        # Rounding can push a perfect match marginally past 1.0
+        return np.clip(scores, -1.0, 1.0)
+
+    def _exact_scores(
+        self,
+        query_embedding: np.ndarray,
+        candidates: List[ViewMetadata]
+    ) -> np.ndarray:
+        """
+        Full-precision cosine scores for a short candidate list.
+
+        The float32 embeddings kept in embeddings_cache act as a shadow
+        of the int8 scan matrix: the quantized GEMV picks the shortlist
+        over all N rows, then this re-scores just the survivors exactly
+        so the final ordering and reported similarities are unaffected
+        by quantization error.
+        """
+        if not candidates:
+            return np.empty(0, dtype=np.float32)
+
+        query_unit = query_embedding / (np.linalg.norm(query_embedding) + 1e-12)
+        rows = np.vstack([
+            self.embeddings_cache[view.semantic_hash] for view in candidates
+        ])
+        # Rows are unit vectors, so the dot product is the cosine
+        return rows @ query_unit.astype(rows.dtype)
+
+    def _view_tokens(self, view: ViewMetadata) -> Set[str]:
+        """Lowercased tokens of a view's name, description, and tags (cached)."""
+        tokens = self._token_cache.get(view.semantic_hash)
+        if tokens is None:
+            text = f"{view.view_name} {view.description or ''} {' '.join(view.tags)}"
+            tokens = set(_TOKEN_RE.findall(text.lower()))
+            self._token_cache[view.semantic_hash] = tokens
+        return tokens
+
+    def _lexical_prefilter(
+        self,
+        query: str,
+        candidates: List[ViewMetadata],
+        top_k: int
+    ) -> Optional[List[ViewMetadata]]:
+        """
+        Cheap token-overlap pre-filter ahead of the semantic scan.
+        Keeps only the top-M candidates by lexical overlap with the query
+        so the GEMV runs over M << N rows. Returns None (full scan) for
+        small candidate sets or when no candidate shares a token.
+        """
+        max_candidates = max(50, top_k * 10)
+        if len(candidates) <= max_candidates:
+            return None
 
-        views = self.catalog.get_all_views()
-        count = 0
+        query_tokens = set(_TOKEN_RE.findall(query.lower()))
+        if not query_tokens:
+            return None
 
-        for view in views:
-            self.embed_view(view)
-            count += 1
+        hits = [
+            (overlap, i)
+            for i, view in enumerate(candidates)
+            if (overlap := len(query_tokens & self._view_tokens(view))) > 0
+        ]
 
-        logger.info(f"Indexed {count} views")
-        return count
+        if not hits:
+            return None  # No lexical signal: fall back to full scan
 
-    def cosine_similarity(self, a: np.ndarray, b: np.ndarray) -> float:
+        hits = heapq.nlargest(max_candidates, hits)
+        return [candidates[i] for _, i in hits]
+
+    def cosine_similarity(self, a: np.ndarray, b: np.ndarray, normalized: bool = False) -> float:
         """
         Calculate cosine similarity between two vectors.
 
         Args:
             a: First vector
             b: Second vector
+            normalized: Set True when both vectors are already unit length
+                (e.g., cached view embeddings), reducing this to a dot product
 
         Returns:
             Similarity score (0-1)
         """
-        dot_product = np.dot(a, b)
-        norm_a = np.linalg.norm(a)
-        norm_b = np.linalg.norm(b)
+        if normalized:
+            return float(np.dot(a, b))
+
+        # Unnormalized fallback: accumulate a.b, |a|^2 and |b|^2 with
+        # reduction-only einsum calls (no intermediate arrays, squared
+        # norms instead of two sqrt-ed np.linalg.norm passes)
+        ab = np.einsum('i,i->', a, b)
+        aa = np.einsum('i,i->', a, a)
+        bb = np.einsum('i,i->', b, b)
 
-        if norm_a == 0 or norm_b == 0:
+        if aa == 0.0 or bb == 0.0:
             return 0.0
 
-        return float(dot_product / (norm_a * norm_b))
+        return float(ab / np.sqrt(aa * bb))
 
     def search(
         self,
@@ -151,7 +489,8 @@ class SemanticSearch:
         top_k: int = 5,
         min_score: float = 0.3,
         domain: Optional[str] = None,
-        layer: Optional[int] = None
+        layer: Optional[int] = None,
+        query_embedding: Optional[np.ndarray] = None
     ) -> List[ViewSearchResult]:
         """
         Search for views semantically similar to the query.
@@ -162,6 +501,8 @@ class SemanticSearch:
             min_score: Minimum similarity score threshold
             domain: Filter by domain (optional)
             layer: Filter by layer (optional)
+            query_embedding: Precomputed embedding of query, if the caller
+                already encoded it (optional)
 
         Returns:
             List of ViewSearchResult sorted by similarity
@@ -169,7 +510,8 @@ class SemanticSearch:
         logger.debug(f"Semantic search query: '{query}' (top_k={top_k}, min_score={min_score})")
 
         # Get query embedding
-        query_embedding = self.embed_text(query)
+        if query_embedding is None:
+            query_embedding = self.embed_text(query)
 
         # Get candidate views
         if domain or layer:
@@ -186,23 +528,31 @@ class SemanticSearch:
             logger.warning("No candidate views found")
             return []
 
-        # Calculate similarities
-        results = []
-        for view in candidates:
-            view_embedding = self.embed_view(view)
-            similarity = self.cosine_similarity(query_embedding, view_embedding)
+        # Narrow large candidate sets by lexical overlap before paying
+        # for embeddings and the similarity scan
+        prefiltered = self._lexical_prefilter(query, candidates, top_k)
+        if prefiltered is not None:
+            logger.debug(f"Lexical pre-filter: {len(candidates)} -> {len(prefiltered)} candidates")
+            candidates = prefiltered
+
+        # Calculate similarities in one batched matrix-vector product
+        scores = self._score_candidates(query_embedding, candidates)
 
-            if similarity >= min_score:
-                results.append(ViewSearchResult(
-                    view=view,
-                    similarity_score=similarity
-                ))
+        # Threshold and select top-k at the array level: only the k
+        # returned results are materialized as Python objects
+        eligible = np.flatnonzero(scores >= min_score)
 
-        # Sort by similarity (descending)
-        results.sort(key=lambda x: x.similarity_score, reverse=True)
+        if top_k < eligible.size:
+            eligible = eligible[np.argpartition(-scores[eligible], top_k)[:top_k]]
 
-        # Return top-k
-        top_results = results[:top_k]
+        # Re-rank the shortlist at full precision (see _exact_scores)
+        exact = self._exact_scores(query_embedding, [candidates[i] for i in eligible])
+        order = np.argsort(-exact)
+
+        top_results = [
+            ViewSearchResult(view=candidates[eligible[i]], similarity_score=float(exact[i]))
+            for i in order
+        ]
 
         logger.info(f"Found {len(top_results)} matching views (from {len(candidates)} candidates)")
 
@@ -235,27 +585,30 @@ class SemanticSearch:
         # Get reference embedding
         ref_embedding = self.embed_view(ref_view)
 
-        # Get all views
-        all_views = self.catalog.get_all_views()
+        # Score every other view in one batched matrix-vector product,
+        # same hot path as search()
+        candidates = [
+            view for view in self.catalog.iter_all_views()
+            if view.view_name != view_name
+        ]
+
+        if not candidates:
+            return []
+
+        scores = self._score_candidates(ref_embedding, candidates)
 
-        # Calculate similarities
-        results = []
-        for view in all_views:
-            if view.view_name == view_name:
-                continue  # Skip self
+        eligible = np.flatnonzero(scores >= min_score)
 
-            view_embedding = self.embed_view(view)
-            similarity = self.cosine_similarity(ref_embedding, view_embedding)
+        if top_k < eligible.size:
+            eligible = eligible[np.argpartition(-scores[eligible], top_k)[:top_k]]
 
-            if similarity >= min_score:
-                results.append(ViewSearchResult(
-                    view=view,
-                    similarity_score=similarity
-                ))
+        exact = self._exact_scores(ref_embedding, [candidates[i] for i in eligible])
+        order = np.argsort(-exact)
 
-        # Sort and return top-k
-        results.sort(key=lambda x: x.similarity_score, reverse=True)
-        return results[:top_k]
+        return [
+            ViewSearchResult(view=candidates[eligible[i]], similarity_score=float(exact[i]))
+            for i in order
+        ]
 
     def search_by_tables(
         self,
@@ -300,6 +653,9 @@ class SemanticSearch:
         """
         logger.info(f"Suggesting views for query: '{query}'")
 
+        # Embed the query once; both branches below reuse it
+        query_embedding = self.embed_text(query)
+
         # If tables are provided, filter by those first
         if tables:
             # Get views that use these tables
@@ -307,27 +663,38 @@ class SemanticSearch:
 
             # If we have table-specific views, do semantic search within them
             if table_views:
-                # Create temporary list for semantic ranking
-                results = []
-                query_embedding = self.embed_text(query)
-
+                # Score the short table-filtered list in one stacked
+                # matrix-vector product instead of a per-view cosine loop
                 for view in table_views:
-                    view_embedding = self.embed_view(view)
-                    similarity = self.cosine_similarity(query_embedding, view_embedding)
-                    results.append(ViewSearchResult(
-                        view=view,
-                        similarity_score=similarity
-                    ))
+                    self.embed_view(view)
+
+                scores = self._exact_scores(query_embedding, table_views)
+                top = np.argsort(-scores)[:top_k]
 
-                results.sort(key=lambda x: x.similarity_score, reverse=True)
-                return results[:top_k]
+                return [
+                    ViewSearchResult(
+                        view=table_views[i],
+                        similarity_score=float(scores[i])
+                    )
+                    for i in top
+                ]
 
-        # Otherwise, do full semantic search
-        return self.search(query, top_k=top_k, min_score=0.2)
+        # Otherwise, do full semantic search (reusing the embedding)
+        return self.search(query, top_k=top_k, min_score=0.2, query_embedding=query_embedding)
 
     def clear_cache(self):
         """Clear the embeddings cache."""
         self.embeddings_cache.clear()
+        self._query_cache.clear()
+        self._token_cache.clear()
+        self._mm = None
+        self._mm_rows = 0
+        self._mm_capacity = 0
+        self._name_to_row = {}
+        self._embedding_matrix = None
+        self._row_scales = None
+        self._row_index = {}
+        self._matrix_dirty = True
         logger.info("Embeddings cache cleared")
 
     def get_cache_stats(self) -> Dict[str, Any]:
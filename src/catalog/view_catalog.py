@@ -3,15 +3,21 @@ View Catalog - Registry and CRUD operations for views.
 This is the central registry that makes views discoverable and tracks their lifecycle.
 """
 
+import json
 import logging
+import sqlite3
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import Iterator, List, Optional, Dict, Any, Tuple, Union
 
 from .models import ViewMetadata, ViewStatistics
 from ..database.connection import DatabaseConnection, get_db
 
 logger = logging.getLogger(__name__)
 
+# Shared SQL text for the lookup hot path: identical statement strings hit
+# sqlite3's per-connection statement cache, skipping re-parse/re-plan
+_FIND_BY_NAME_SQL = "SELECT * FROM view_catalog WHERE view_name = ?"
+
 
 class ViewCatalog:
     """
@@ -27,6 +33,43 @@ class ViewCatalog:
             db: DatabaseConnection instance (uses global if None)
         """
         self.db = db or get_db()
+        self._view_index: Optional[Dict[str, ViewMetadata]] = None
+        # Monotonic write counter; bumps on every catalog write so callers
+        # can key caches of derived structures (e.g. the unified graph)
+        self.version = 0
+        self._ro_conn: Optional[sqlite3.Connection] = None
+
+    def transaction(self):
+        """
+        Context manager batching multiple catalog writes in one transaction.
+
+        Usage:
+            with catalog.transaction():
+                catalog.register_view(view1)
+                catalog.register_view(view2)
+        """
+        return self.db.transaction()
+
+    def _load_view_index(self) -> Dict[str, ViewMetadata]:
+        """
+        Load all views into a name-keyed dict with a single query.
+        Cached on the catalog; invalidated whenever a view is written.
+
+        Returns:
+            Dict mapping view_name to ViewMetadata
+        """
+        if self._view_index is None:
+            results = self.db.execute_query("SELECT * FROM view_catalog")
+            self._view_index = {
+                view.view_name: view
+                for view in (ViewMetadata.from_trusted_row(row) for row in results)
+            }
+        return self._view_index
+
+    def _invalidate_view_index(self):
+        """Drop the cached view index after a catalog write."""
+        self._view_index = None
+        self.version += 1
 
     def register_view(self, view: ViewMetadata) -> ViewMetadata:
         """
@@ -41,11 +84,6 @@ class ViewCatalog:
         Raises:
             ValueError: If view_name already exists
         """
-        # Check if view already exists
-        existing = self.find_by_name(view.view_name)
-        if existing:
-            raise ValueError(f"View already exists: {view.view_name}")
-
         # Set created_date if not provided
         if not view.created_date:
             view.created_date = datetime.now()
@@ -69,17 +107,96 @@ class ViewCatalog:
 
         values = tuple(db_data[col] for col in columns)
 
-        # Execute insert
+        # Execute insert (commit is deferred inside a transaction block);
+        # duplicates are rejected by the UNIQUE constraint on view_name,
+        # so no pre-check query is needed
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute(query, values)
-            conn.commit()
-            view_id = cursor.lastrowid
+            try:
+                cursor.execute(query, values)
+            except sqlite3.IntegrityError:
+                # The failed INSERT opened an implicit write transaction
+                # on the long-lived connection; roll it back before
+                # translating to ValueError, since get_connection only
+                # rolls back on sqlite3.Error. Inside an explicit
+                # transaction block the outer handler does the rollback.
+                if not self.db.in_transaction:
+                    conn.rollback()
+                raise ValueError(f"View already exists: {view.view_name}")
+            if not self.db.in_transaction:
+                conn.commit()
+            view.view_id = cursor.lastrowid
+
+        self._invalidate_view_index()
+        logger.info(f"View registered: {view.view_name} (ID: {view.view_id})")
+
+        # The caller already holds the full metadata; no re-query needed
+        return view
+
+    def register_views_bulk(self, views: List[ViewMetadata]) -> List[ViewMetadata]:
+        """
+        Register many views in a single transaction.
+        One executemany INSERT and one commit (one fsync) replace the
+        per-view INSERT + commit of looped register_view calls; duplicates
+        are checked with a single batched probe.
+
+        Args:
+            views: ViewMetadata instances to register
+
+        Returns:
+            The input views with populated view_ids
+
+        Raises:
+            ValueError: If any view_name already exists or repeats in the batch
+        """
+        if not views:
+            return []
+
+        names = [view.view_name for view in views]
+        if len(set(names)) != len(names):
+            raise ValueError("Duplicate view names in batch")
 
-        logger.info(f"View registered: {view.view_name} (ID: {view_id})")
+        placeholders = ', '.join(['?' for _ in names])
+        existing = self.db.execute_query(
+            f"SELECT view_name FROM view_catalog WHERE view_name IN ({placeholders})",
+            tuple(names)
+        )
+        if existing:
+            raise ValueError(f"Views already exist: {[row['view_name'] for row in existing]}")
+
+        now = datetime.now()
+        for view in views:
+            if not view.created_date:
+                view.created_date = now
+            if not view.last_validated:
+                view.last_validated = now
+
+        # Fixed column set so every row binds to the same statement
+        db_dicts = [view.to_db_dict() for view in views]
+        columns = [k for k in db_dicts[0].keys() if k != 'view_id']
+        insert_sql = f"""
+            INSERT INTO view_catalog ({', '.join(columns)})
+            VALUES ({', '.join(['?' for _ in columns])})
+        """
+        rows = [tuple(d[col] for col in columns) for d in db_dicts]
+
+        with self.db.transaction() as conn:
+            conn.executemany(insert_sql, rows)
+
+        self._invalidate_view_index()
+
+        # Backfill ids with one batched SELECT (lastrowid is not defined
+        # for executemany)
+        results = self.db.execute_query(
+            f"SELECT view_id, view_name FROM view_catalog WHERE view_name IN ({placeholders})",
+            tuple(names)
+        )
+        id_map = {row['view_name']: row['view_id'] for row in results}
+        for view in views:
+            view.view_id = id_map.get(view.view_name)
 
-        # Retrieve and return the full view
-        return self.find_by_id(view_id)
+        logger.info(f"Bulk registered {len(views)} views")
+        return views
 
     def find_by_id(self, view_id: int) -> Optional[ViewMetadata]:
         """
@@ -95,9 +212,34 @@ class ViewCatalog:
         results = self.db.execute_query(query, (view_id,))
 
         if results:
-            return ViewMetadata.from_db_row(dict(results[0]))
+            return ViewMetadata.from_trusted_row(results[0])
         return None
 
+    def _read_connection(self) -> Optional[sqlite3.Connection]:
+        """
+        Persistent read-only connection for lookup hot paths.
+        Opened lazily; returns None inside a transaction block (reads must
+        see the transaction's own writes) or if the database file is not
+        openable read-only yet, in which case callers fall back to the
+        pooled path.
+        """
+        if self.db.in_transaction:
+            return None
+
+        if self._ro_conn is None:
+            try:
+                conn = sqlite3.connect(
+                    f"file:{self.db.db_path}?mode=ro",
+                    uri=True,
+                    check_same_thread=False
+                )
+                conn.row_factory = sqlite3.Row
+                self._ro_conn = conn
+            except sqlite3.Error:
+                return None
+
+        return self._ro_conn
+
     def find_by_name(self, view_name: str) -> Optional[ViewMetadata]:
         """
         Find a view by its name.
@@ -108,11 +250,15 @@ class ViewCatalog:
         Returns:
             ViewMetadata if found, None otherwise
         """
-        query = "SELECT * FROM view_catalog WHERE view_name = ?"
-        results = self.db.execute_query(query, (view_name,))
+        conn = self._read_connection()
+        if conn is not None:
+            row = conn.execute(_FIND_BY_NAME_SQL, (view_name,)).fetchone()
+            return ViewMetadata.from_trusted_row(row) if row else None
+
+        results = self.db.execute_query(_FIND_BY_NAME_SQL, (view_name,))
 
         if results:
-            return ViewMetadata.from_db_row(dict(results[0]))
+            return ViewMetadata.from_trusted_row(results[0])
         return None
 
     def find_by_domain(self, domain: str, layer: Optional[int] = None) -> List[ViewMetadata]:
@@ -133,15 +279,20 @@ class ViewCatalog:
             query = "SELECT * FROM view_catalog WHERE domain = ? ORDER BY usage_count DESC"
             results = self.db.execute_query(query, (domain,))
 
-        return [ViewMetadata.from_db_row(dict(row)) for row in results]
+        return [ViewMetadata.from_trusted_row(row) for row in results]
 
-    def get_all_views(self, layer: Optional[int] = None, status: Optional[str] = None) -> List[ViewMetadata]:
+    def get_all_views(
+        self,
+        layer: Optional[int] = None,
+        status: Optional[Union[str, List[str]]] = None
+    ) -> List[ViewMetadata]:
         """
         Get all views, optionally filtered by layer and/or status.
 
         Args:
             layer: View layer (optional)
-            status: View status (optional)
+            status: View status, a single value or a list of acceptable
+                values (optional)
 
         Returns:
             List of ViewMetadata
@@ -154,13 +305,49 @@ class ViewCatalog:
             params.append(layer)
 
         if status:
-            query += " AND status = ?"
-            params.append(status)
+            if isinstance(status, str):
+                status = [status]
+            # One IN query instead of a full scan per status value
+            query += f" AND status IN ({', '.join('?' * len(status))})"
+            params.extend(status)
 
         query += " ORDER BY usage_count DESC, created_date DESC"
 
         results = self.db.execute_query(query, tuple(params) if params else None)
-        return [ViewMetadata.from_db_row(dict(row)) for row in results]
+        return [ViewMetadata.from_trusted_row(row) for row in results]
+
+    def find_names_with_prefix(self, prefix: str) -> List[str]:
+        """
+        Get all view names starting with a prefix, in one LIKE query.
+
+        Args:
+            prefix: Name prefix
+
+        Returns:
+            List of matching view names
+        """
+        results = self.db.execute_query(
+            "SELECT view_name FROM view_catalog WHERE view_name LIKE ? || '%'",
+            (prefix,)
+        )
+        return [row['view_name'] for row in results]
+
+    def iter_all_views(self) -> Iterator[ViewMetadata]:
+        """
+        Iterate over all views without materializing the full list.
+        Rows are decoded one at a time off an open cursor, so callers that
+        stream (indexing, statistics) keep peak memory at O(1) views.
+
+        Returns:
+            Iterator of ViewMetadata
+        """
+        query = "SELECT * FROM view_catalog ORDER BY usage_count DESC, created_date DESC"
+
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query)
+            for row in cursor:
+                yield ViewMetadata.from_trusted_row(row)
 
     def increment_usage(self, view_name: str) -> bool:
         """
@@ -172,25 +359,46 @@ class ViewCatalog:
         Returns:
             True if successful, False otherwise
         """
+        # Increment and auto-promote in one atomic statement: the CASE
+        # applies the DRAFT->PROMOTED transition at the threshold without
+        # a re-read, closing the read-then-promote race
         query = """
             UPDATE view_catalog
             SET usage_count = usage_count + 1,
-                last_used = ?
+                last_used = ?,
+                status = CASE
+                    WHEN usage_count + 1 >= 3 AND status = 'DRAFT'
+                    THEN 'PROMOTED' ELSE status
+                END,
+                promoted_date = CASE
+                    WHEN usage_count + 1 >= 3 AND status = 'DRAFT'
+                    THEN ? ELSE promoted_date
+                END
             WHERE view_name = ?
+            RETURNING usage_count, status
         """
 
+        now = datetime.now().isoformat()
+
         try:
-            rows_affected = self.db.execute_update(query, (datetime.now().isoformat(), view_name))
-            if rows_affected > 0:
-                logger.debug(f"Incremented usage for view: {view_name}")
+            with self.db.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(query, (now, now, view_name))
+                row = cursor.fetchone()
+                if not self.db.in_transaction:
+                    conn.commit()
 
-                # Check if auto-promotion threshold reached
-                view = self.find_by_name(view_name)
-                if view and view.usage_count >= 3 and view.status == 'DRAFT':
-                    self.promote_view(view_name)
+            if row is None:
+                return False
 
-                return True
-            return False
+            self._invalidate_view_index()
+            logger.debug(f"Incremented usage for view: {view_name}")
+
+            usage_count, status = row[0], row[1]
+            if status == 'PROMOTED' and usage_count == 3:
+                logger.info(f"View promoted: {view_name}")
+
+            return True
         except Exception as e:
             logger.error(f"Failed to increment usage for {view_name}: {e}")
             return False
@@ -215,6 +423,7 @@ class ViewCatalog:
         try:
             rows_affected = self.db.execute_update(query, (datetime.now().isoformat(), view_name))
             if rows_affected > 0:
+                self._invalidate_view_index()
                 logger.info(f"View promoted: {view_name}")
                 return True
             return False
@@ -245,6 +454,7 @@ class ViewCatalog:
         try:
             rows_affected = self.db.execute_update(query, values)
             if rows_affected > 0:
+                self._invalidate_view_index()
                 logger.debug(f"View updated: {view_name}")
                 return True
             return False
@@ -271,28 +481,36 @@ class ViewCatalog:
         Returns:
             ViewStatistics object
         """
-        all_views = self.get_all_views()
+        # Aggregate in SQL: one connection, grouped counts in-engine,
+        # no ViewMetadata hydration except for the single most-used row
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
 
-        stats = ViewStatistics(
-            total_views=len(all_views),
-            by_layer={},
-            by_domain={},
-            by_status={},
-            total_usage=0
-        )
+            cursor.execute("SELECT COUNT(*), COALESCE(SUM(usage_count), 0) FROM view_catalog")
+            total_views, total_usage = cursor.fetchone()
 
-        # Count by layer, domain, status
-        for view in all_views:
-            stats.by_layer[view.layer] = stats.by_layer.get(view.layer, 0) + 1
-            stats.by_domain[view.domain] = stats.by_domain.get(view.domain, 0) + 1
-            stats.by_status[view.status] = stats.by_status.get(view.status, 0) + 1
-            stats.total_usage += view.usage_count
+            cursor.execute("SELECT layer, COUNT(*) FROM view_catalog GROUP BY layer")
+            by_layer = {row[0]: row[1] for row in cursor.fetchall()}
 
-        # Find most used view
-        if all_views:
-            stats.most_used = max(all_views, key=lambda v: v.usage_count)
+            cursor.execute("SELECT domain, COUNT(*) FROM view_catalog GROUP BY domain")
+            by_domain = {row[0]: row[1] for row in cursor.fetchall()}
 
-        return stats
+            cursor.execute("SELECT status, COUNT(*) FROM view_catalog GROUP BY status")
+            by_status = {row[0]: row[1] for row in cursor.fetchall()}
+
+            most_used = None
+            if total_views:
+                cursor.execute("SELECT * FROM view_catalog ORDER BY usage_count DESC LIMIT 1")
+                most_used = ViewMetadata.from_trusted_row(cursor.fetchone())
+
+        return ViewStatistics(
+            total_views=total_views,
+            by_layer=by_layer,
+            by_domain=by_domain,
+            by_status=by_status,
+            total_usage=total_usage,
+            most_used=most_used
+        )
 
     def find_by_base_tables(self, table_names: List[str]) -> List[ViewMetadata]:
         """
@@ -304,15 +522,71 @@ class ViewCatalog:
         Returns:
             List of ViewMetadata
         """
-        all_views = self.get_all_views()
-        matching_views = []
+        if not table_names:
+            return []
 
-        for view in all_views:
-            # Check if any of the view's base tables match
-            if any(table in view.base_tables for table in table_names):
-                matching_views.append(view)
+        # Filter in SQL via json_each so only matching rows cross the wire
+        placeholders = ', '.join(['?' for _ in table_names])
+        query = f"""
+            SELECT * FROM view_catalog
+            WHERE EXISTS (
+                SELECT 1 FROM json_each(view_catalog.base_tables)
+                WHERE json_each.value IN ({placeholders})
+            )
+            ORDER BY usage_count DESC
+        """
 
-        return matching_views
+        results = self.db.execute_query(query, tuple(table_names))
+        views = [ViewMetadata.from_trusted_row(row) for row in results]
+
+        # Post-verify in Python (cheap on the already-filtered set)
+        return [
+            view for view in views
+            if any(table in view.base_tables for table in table_names)
+        ]
+
+    def find_views_touching_tables(
+        self,
+        table_names: List[str],
+        exclude: Optional[str] = None
+    ) -> List[Tuple[str, List[str]]]:
+        """
+        Views whose base tables overlap the given tables, with the
+        overlapping tables per view, sorted by overlap size descending.
+
+        The overlap is computed inside SQLite (json_each + IN + GROUP
+        BY) so only the matches cross the wire, instead of scanning the
+        whole catalog and intersecting sets in Python.
+
+        Args:
+            table_names: Tables to test overlap against
+            exclude: View name to leave out (e.g. the view under analysis)
+
+        Returns:
+            List of (view_name, overlapping_tables) tuples
+        """
+        if not table_names:
+            return []
+
+        placeholders = ', '.join('?' * len(table_names))
+        query = f"""
+            SELECT vc.view_name, json_group_array(je.value) AS overlap
+            FROM view_catalog vc, json_each(vc.base_tables) je
+            WHERE je.value IN ({placeholders})
+        """
+        params: List[Any] = list(table_names)
+
+        if exclude is not None:
+            query += " AND vc.view_name != ?"
+            params.append(exclude)
+
+        query += " GROUP BY vc.view_name ORDER BY COUNT(*) DESC"
+
+        results = self.db.execute_query(query, tuple(params))
+        return [
+            (row['view_name'], json.loads(row['overlap']))
+            for row in results
+        ]
 
     def get_view_lineage(self, view_name: str) -> Dict[str, Any]:
         """
@@ -324,62 +598,85 @@ class ViewCatalog:
         Returns:
             Dict with lineage information
         """
-        view = self.find_by_name(view_name)
+        # One query for the whole catalog; dependency walks below are
+        # O(1) dict lookups instead of per-dependency SQL round-trips
+        index = self._load_view_index()
+
+        view = index.get(view_name)
         if not view:
             return {}
 
         # Get upstream dependencies (views this view depends on)
-        upstream = []
-        for dep_view_name in view.depends_on_views:
-            dep_view = self.find_by_name(dep_view_name)
-            if dep_view:
-                upstream.append(dep_view)
+        upstream = [
+            index[dep_view_name]
+            for dep_view_name in view.depends_on_views
+            if dep_view_name in index
+        ]
 
         # Get downstream dependencies (views that depend on this view)
-        downstream = []
-        for user_view_name in view.used_by_views:
-            user_view = self.find_by_name(user_view_name)
-            if user_view:
-                downstream.append(user_view)
+        downstream = [
+            index[user_view_name]
+            for user_view_name in view.used_by_views
+            if user_view_name in index
+        ]
 
         return {
             'view': view,
             'base_tables': view.base_tables,
             'upstream_views': upstream,
             'downstream_views': downstream,
-            'total_depth': self._calculate_depth(view)
+            'total_depth': self._calculate_depth(view, index=index)
         }
 
-    def _calculate_depth(self, view: ViewMetadata, visited: Optional[set] = None) -> int:
+    def _calculate_depth(
+        self,
+        view: ViewMetadata,
+        index: Optional[Dict[str, ViewMetadata]] = None
+    ) -> int:
         """
         Calculate the depth of a view in the dependency tree.
+        Memoized DFS over the in-memory index: each view's depth is
+        computed exactly once, with a recursion-stack set for cycles.
 
         Args:
             view: ViewMetadata
-            visited: Set of visited view names (to prevent cycles)
+            index: Preloaded name->view index (loaded once if None)
 
         Returns:
             Maximum depth
         """
-        if visited is None:
-            visited = set()
+        if index is None:
+            index = self._load_view_index()
 
-        if view.view_name in visited:
-            return 0  # Cycle detected, stop recursion
+        memo: Dict[str, int] = {}
+        on_stack = {view.view_name}
 
-        visited.add(view.view_name)
+        def depth(name: str) -> int:
+            cached = memo.get(name)
+            if cached is not None:
+                return cached
+
+            if name in on_stack:
+                return 0  # Back-edge: cycle detected, stop here
+
+            node = index.get(name)
+            if node is None or not node.depends_on_views:
+                memo[name] = 0
+                return 0
+
+            on_stack.add(name)
+            child_depths = [depth(dep) for dep in node.depends_on_views if dep in index]
+            on_stack.discard(name)
+
+            result = 1 + max(child_depths) if child_depths else 0
+            memo[name] = result
+            return result
 
         if not view.depends_on_views:
             return 0  # Leaf view
 
-        max_depth = 0
-        for dep_view_name in view.depends_on_views:
-            dep_view = self.find_by_name(dep_view_name)
-            if dep_view:
-                depth = self._calculate_depth(dep_view, visited.copy())
-                max_depth = max(max_depth, depth + 1)
-
-        return max_depth
+        child_depths = [depth(dep) for dep in view.depends_on_views if dep in index]
+        return 1 + max(child_depths) if child_depths else 0
 
     def print_catalog(self, layer: Optional[int] = None):
         """
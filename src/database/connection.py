@@ -2,15 +2,89 @@
 Database connection manager for SQLite with context manager pattern.
 """
 
+import functools
 import sqlite3
+import json
 import logging
 import math
+import queue
+import re
+import threading
 from pathlib import Path
 from typing import Optional
 from contextlib import contextmanager
 
 logger = logging.getLogger(__name__)
 
+# Serialize lists/dicts to JSON at bind time so callers can pass Python
+# objects directly for JSON text columns (e.g., view_catalog lineage fields)
+sqlite3.register_adapter(list, json.dumps)
+sqlite3.register_adapter(dict, json.dumps)
+
+# Hot introspection queries as module constants: identical SQL text hits
+# sqlite3's per-connection statement cache, skipping re-parse/re-plan
+_TABLE_EXISTS_SQL = "SELECT name FROM sqlite_master WHERE type='table' AND name=?"
+_VIEW_EXISTS_SQL = "SELECT name FROM sqlite_master WHERE type='view' AND name=?"
+_ALL_TABLES_SQL = "SELECT name FROM sqlite_master WHERE type='table' ORDER BY name"
+_ALL_VIEWS_SQL = "SELECT name FROM sqlite_master WHERE type='view' ORDER BY name"
+
+# Whole-schema introspection via pragma table-valued functions: one
+# query each for columns and foreign keys instead of a PRAGMA per table
+_SCHEMA_COLUMNS_SQL = """
+    SELECT m.name AS tbl, ti.name, ti.type, ti."notnull", ti.pk
+    FROM sqlite_master m, pragma_table_info(m.name) ti
+    WHERE m.type = 'table'
+"""
+_SCHEMA_FOREIGN_KEYS_SQL = """
+    SELECT m.name AS tbl, fk."from", fk."table", fk."to"
+    FROM sqlite_master m, pragma_foreign_key_list(m.name) fk
+    WHERE m.type = 'table'
+"""
+
+_IDENTIFIER_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*\Z")
+
+
+def validate_identifier(name: str) -> str:
+    """
+    Validate a table/view identifier before interpolating it into SQL.
+
+    Args:
+        name: Candidate identifier
+
+    Returns:
+        The identifier unchanged
+
+    Raises:
+        ValueError: If the name is not a plain SQL identifier
+    """
+    if not _IDENTIFIER_RE.match(name):
+        raise ValueError(f"Invalid SQL identifier: {name!r}")
+    return name
+
+
+# Identifier-interpolated statements, validated and formatted once per
+# name; repeated introspection reuses the exact same string (and thus
+# the connection's statement cache)
+@functools.lru_cache(maxsize=512)
+def _row_count_sql(table_name: str) -> str:
+    return f'SELECT COUNT(*) as count FROM "{validate_identifier(table_name)}"'
+
+
+@functools.lru_cache(maxsize=512)
+def _table_info_sql(table_name: str) -> str:
+    return f'PRAGMA table_info("{validate_identifier(table_name)}")'
+
+
+@functools.lru_cache(maxsize=512)
+def _foreign_key_sql(table_name: str) -> str:
+    return f'PRAGMA foreign_key_list("{validate_identifier(table_name)}")'
+
+
+@functools.lru_cache(maxsize=8)
+def _read_script(path: str, mtime_ns: int) -> str:
+    """Read a SQL script, cached until the file's mtime changes."""
+    return Path(path).read_text()
+
 
 class DatabaseConnection:
     """
@@ -25,6 +99,21 @@ class DatabaseConnection:
 
     _instance: Optional['DatabaseConnection'] = None
     _db_path: Optional[Path] = None
+    _txn_conn: Optional[sqlite3.Connection] = None
+
+    # journal_mode=WAL is persistent on disk, so it only needs to be set
+    # once per database file
+    _wal_set: set = set()
+
+    # One long-lived connection per thread: keeps SQLite's page cache
+    # warm across calls instead of reopening the db/-wal/-shm files for
+    # every statement
+    _local = threading.local()
+
+    # Pool of read-only connections for query paths; under WAL these
+    # proceed concurrently with the single writer
+    _ro_pool: Optional['queue.Queue[sqlite3.Connection]'] = None
+    _RO_POOL_SIZE = 4
 
     def __new__(cls, db_path: Optional[str] = None):
         if cls._instance is None:
@@ -37,6 +126,11 @@ class DatabaseConnection:
             self._initialized = True
             logger.info(f"Database connection manager initialized: {self._db_path}")
 
+    @property
+    def in_transaction(self) -> bool:
+        """Whether a transaction() block is currently active."""
+        return self._txn_conn is not None
+
     @property
     def db_path(self) -> Path:
         """Get the database path."""
@@ -44,10 +138,68 @@ class DatabaseConnection:
             raise RuntimeError("Database path not set. Initialize with db_path parameter.")
         return self._db_path
 
+    def _open_connection(self) -> sqlite3.Connection:
+        """Open and configure a new sqlite3 connection."""
+        # Ensure parent directory exists
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Create connection, with room for every hot statement in the
+        # internal prepared-statement cache
+        conn = sqlite3.connect(str(self.db_path), cached_statements=256)
+
+        # Enable foreign keys
+        conn.execute("PRAGMA foreign_keys = ON")
+
+        # Tuned pragmas: WAL lets readers run concurrently with a writer
+        # and synchronous=NORMAL halves fsyncs per commit (safe under WAL);
+        # the rest size the page cache, keep temp tables off disk, and
+        # memory-map reads
+        db_key = str(self.db_path)
+        if db_key != ':memory:':
+            if db_key not in DatabaseConnection._wal_set:
+                conn.execute("PRAGMA journal_mode = WAL")
+                DatabaseConnection._wal_set.add(db_key)
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.execute("PRAGMA cache_size = -65536")
+            conn.execute("PRAGMA temp_store = MEMORY")
+            conn.execute("PRAGMA mmap_size = 268435456")
+            conn.execute("PRAGMA busy_timeout = 5000")
+
+        # Return rows as Row objects (dict-like access)
+        conn.row_factory = sqlite3.Row
+
+        self._register_functions(conn)
+
+        logger.debug("Database connection opened: %s", self.db_path)
+        return conn
+
+    @staticmethod
+    def _register_functions(conn: sqlite3.Connection) -> None:
+        """Register custom SQL functions/aggregates on a connection."""
+        class StdDevAggregate:
+            def __init__(self):
+                self.values = []
+
+            def step(self, value):
+                if value is not None:
+                    self.values.append(float(value))
+
+            def finalize(self):
+                if len(self.values) < 2:
+                    return 0.0
+                n = len(self.values)
+                mean = sum(self.values) / n
+                variance = sum((x - mean) ** 2 for x in self.values) / (n - 1)
+                return math.sqrt(variance)
+
+        conn.create_aggregate("STDDEV", 1, StdDevAggregate)
+
     @contextmanager
     def get_connection(self):
         """
         Get a database connection with automatic cleanup.
+        Inside a transaction() block, yields the shared transaction
+        connection instead of opening a new one.
 
         Yields:
             sqlite3.Connection: Database connection
@@ -58,52 +210,123 @@ class DatabaseConnection:
                 cursor.execute("SELECT * FROM table")
                 results = cursor.fetchall()
         """
-        conn = None
+        if self._txn_conn is not None:
+            yield self._txn_conn
+            return
+
+        conn = self._cached_connection()
         try:
-            # Ensure parent directory exists
-            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            yield conn
 
-            # Create connection
-            conn = sqlite3.connect(str(self.db_path))
+        except sqlite3.Error as e:
+            logger.error(f"Database error: {e}")
+            conn.rollback()
+            raise
 
-            # Enable foreign keys
-            conn.execute("PRAGMA foreign_keys = ON")
+    def _cached_connection(self) -> sqlite3.Connection:
+        """Get (opening if needed) this thread's long-lived connection."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._open_connection()
+            self._local.conn = conn
+        return conn
 
-            # Return rows as Row objects (dict-like access)
-            conn.row_factory = sqlite3.Row
+    @contextmanager
+    def get_reader(self):
+        """
+        Get a read-only connection from the pool for SELECT workloads.
+        Under WAL, readers proceed concurrently with the writer. Inside a
+        transaction block (reads must see its writes), or when a
+        read-only connection cannot be opened, falls back to the shared
+        read-write connection.
 
-            # Register custom aggregate functions
-            class StdDevAggregate:
-                def __init__(self):
-                    self.values = []
+        Yields:
+            sqlite3.Connection: Read-only (or fallback) connection
+        """
+        if self._txn_conn is not None:
+            yield self._txn_conn
+            return
 
-                def step(self, value):
-                    if value is not None:
-                        self.values.append(float(value))
+        conn = self._acquire_reader()
+        if conn is None:
+            with self.get_connection() as rw_conn:
+                yield rw_conn
+            return
 
-                def finalize(self):
-                    if len(self.values) < 2:
-                        return 0.0
-                    n = len(self.values)
-                    mean = sum(self.values) / n
-                    variance = sum((x - mean) ** 2 for x in self.values) / (n - 1)
-                    return math.sqrt(variance)
+        try:
+            yield conn
+        finally:
+            self._ro_pool.put(conn)
 
-            conn.create_aggregate("STDDEV", 1, StdDevAggregate)
+    def _acquire_reader(self) -> Optional[sqlite3.Connection]:
+        """Take a pooled read-only connection, building the pool lazily."""
+        if self._ro_pool is None:
+            try:
+                conns = []
+                for _ in range(self._RO_POOL_SIZE):
+                    conn = sqlite3.connect(
+                        f"file:{self.db_path}?mode=ro",
+                        uri=True,
+                        check_same_thread=False,
+                        cached_statements=256
+                    )
+                    conn.row_factory = sqlite3.Row
+                    conn.execute("PRAGMA busy_timeout = 5000")
+                    self._register_functions(conn)
+                    conns.append(conn)
+            except sqlite3.Error:
+                # Database file not openable read-only (yet)
+                for conn in conns:
+                    conn.close()
+                return None
+
+            pool = queue.Queue()
+            for conn in conns:
+                pool.put(conn)
+            DatabaseConnection._ro_pool = pool
 
-            logger.debug(f"Database connection opened: {self.db_path}")
-            yield conn
+        try:
+            return self._ro_pool.get(timeout=5)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        """Close this thread's cached connection (call on shutdown)."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+            logger.debug("Database connection closed")
 
-        except sqlite3.Error as e:
-            logger.error(f"Database error: {e}")
-            if conn:
-                conn.rollback()
-            raise
+    @contextmanager
+    def transaction(self):
+        """
+        Run multiple statements in a single transaction.
+        All get_connection()/execute_update() calls inside the block share
+        one connection and commit together on exit (one fsync instead of
+        one per statement). Rolls back on exception.
 
+        Yields:
+            sqlite3.Connection: Shared transaction connection
+        """
+        if self._txn_conn is not None:
+            # Already in a transaction; nest as a no-op
+            yield self._txn_conn
+            return
+
+        conn = self._cached_connection()
+        self._txn_conn = conn
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            yield conn
+            conn.commit()
+            logger.debug("Transaction committed")
+        except Exception:
+            conn.rollback()
+            logger.error("Transaction rolled back")
+            raise
         finally:
-            if conn:
-                conn.close()
-                logger.debug("Database connection closed")
+            self._txn_conn = None
 
     def execute_script(self, script: str) -> None:
         """
@@ -132,7 +355,8 @@ class DatabaseConnection:
         if not script_file.exists():
             raise FileNotFoundError(f"SQL script not found: {script_path}")
 
-        script = script_file.read_text()
+        # Cached by (path, mtime): frequent re-inits skip the read+decode
+        script = _read_script(str(script_file), script_file.stat().st_mtime_ns)
         self.execute_script(script)
         logger.info(f"SQL script file executed: {script_path}")
 
@@ -147,16 +371,44 @@ class DatabaseConnection:
         Returns:
             List of Row objects (dict-like access)
         """
-        with self.get_connection() as conn:
+        with self.get_reader() as conn:
             cursor = conn.cursor()
             if params:
                 cursor.execute(query, params)
             else:
                 cursor.execute(query)
             results = cursor.fetchall()
-            logger.debug(f"Query executed, returned {len(results)} rows")
+            logger.debug("Query executed, returned %d rows", len(results))
             return results
 
+    def iter_query(self, query: str, params: Optional[tuple] = None, chunk_size: int = 1000):
+        """
+        Execute a SELECT query and yield rows incrementally.
+        Rows are fetched in chunks off an open cursor, so peak memory is
+        O(chunk_size) instead of O(result size) like execute_query.
+
+        Args:
+            query: SQL query string
+            params: Query parameters (optional)
+            chunk_size: Rows fetched per round-trip
+
+        Yields:
+            Row objects (dict-like access)
+        """
+        with self.get_reader() as conn:
+            cursor = conn.cursor()
+            cursor.arraysize = chunk_size
+            if params:
+                cursor.execute(query, params)
+            else:
+                cursor.execute(query)
+
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield from rows
+
     def execute_update(self, query: str, params: Optional[tuple] = None) -> int:
         """
         Execute an INSERT/UPDATE/DELETE query.
@@ -174,9 +426,36 @@ class DatabaseConnection:
                 cursor.execute(query, params)
             else:
                 cursor.execute(query)
-            conn.commit()
+            if self._txn_conn is None:
+                conn.commit()
             rows_affected = cursor.rowcount
-            logger.debug(f"Update executed, {rows_affected} rows affected")
+            logger.debug("Update executed, %d rows affected", rows_affected)
+            return rows_affected
+
+    def execute_many(self, query: str, rows: list) -> int:
+        """
+        Execute one INSERT/UPDATE/DELETE statement for many parameter rows.
+        The whole batch commits as a single transaction (one fsync),
+        replacing a loop of execute_update calls.
+
+        Args:
+            query: SQL query string with placeholders
+            rows: Sequence of parameter tuples
+
+        Returns:
+            Number of rows affected
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            if self._txn_conn is None:
+                conn.execute("BEGIN IMMEDIATE")
+                cursor.executemany(query, rows)
+                conn.commit()
+            else:
+                # Inside a transaction() block: batch joins the open txn
+                cursor.executemany(query, rows)
+            rows_affected = cursor.rowcount
+            logger.debug("Batch executed, %d rows affected", rows_affected)
             return rows_affected
 
     def table_exists(self, table_name: str) -> bool:
@@ -189,11 +468,7 @@ class DatabaseConnection:
         Returns:
             True if table exists, False otherwise
         """
-        query = """
-            SELECT name FROM sqlite_master
-            WHERE type='table' AND name=?
-        """
-        results = self.execute_query(query, (table_name,))
+        results = self.execute_query(_TABLE_EXISTS_SQL, (table_name,))
         return len(results) > 0
 
     def view_exists(self, view_name: str) -> bool:
@@ -206,11 +481,7 @@ class DatabaseConnection:
         Returns:
             True if view exists, False otherwise
         """
-        query = """
-            SELECT name FROM sqlite_master
-            WHERE type='view' AND name=?
-        """
-        results = self.execute_query(query, (view_name,))
+        results = self.execute_query(_VIEW_EXISTS_SQL, (view_name,))
         return len(results) > 0
 
     def get_table_info(self, table_name: str) -> list:
@@ -223,8 +494,7 @@ class DatabaseConnection:
         Returns:
             List of column info dicts
         """
-        query = f"PRAGMA table_info({table_name})"
-        return self.execute_query(query)
+        return self.execute_query(_table_info_sql(table_name))
 
     def get_foreign_keys(self, table_name: str) -> list:
         """
@@ -236,8 +506,39 @@ class DatabaseConnection:
         Returns:
             List of foreign key info dicts
         """
-        query = f"PRAGMA foreign_key_list({table_name})"
-        return self.execute_query(query)
+        return self.execute_query(_foreign_key_sql(table_name))
+
+    def get_all_schema_metadata(self) -> tuple[dict, dict, dict]:
+        """
+        Fetch row counts, columns and foreign keys for every table with
+        three bulk queries instead of three per-table round trips,
+        removing the N+1 pattern from schema-wide consumers.
+
+        Returns:
+            Tuple of (row_counts, columns_by_table, fks_by_table), each
+            a dict keyed by table name
+        """
+        tables = self.get_all_tables()
+        row_counts = self.get_row_counts(tables)
+
+        columns_by_table = {table: [] for table in tables}
+        for col in self.execute_query(_SCHEMA_COLUMNS_SQL):
+            columns_by_table[col['tbl']].append({
+                'name': col['name'],
+                'type': col['type'],
+                'notnull': bool(col['notnull']),
+                'pk': bool(col['pk'])
+            })
+
+        fks_by_table = {table: [] for table in tables}
+        for fk in self.execute_query(_SCHEMA_FOREIGN_KEYS_SQL):
+            fks_by_table[fk['tbl']].append({
+                'from': fk['from'],
+                'table': fk['table'],
+                'to': fk['to']
+            })
+
+        return row_counts, columns_by_table, fks_by_table
 
     def get_all_tables(self) -> list[str]:
         """
@@ -246,12 +547,7 @@ class DatabaseConnection:
         Returns:
             List of table names
         """
-        query = """
-            SELECT name FROM sqlite_master
-            WHERE type='table'
-            ORDER BY name
-        """
-        results = self.execute_query(query)
+        results = self.execute_query(_ALL_TABLES_SQL)
         return [row['name'] for row in results]
 
     def get_all_views(self) -> list[str]:
@@ -261,28 +557,105 @@ class DatabaseConnection:
         Returns:
             List of view names
         """
-        query = """
-            SELECT name FROM sqlite_master
-            WHERE type='view'
-            ORDER BY name
-        """
-        results = self.execute_query(query)
+        results = self.execute_query(_ALL_VIEWS_SQL)
         return [row['name'] for row in results]
 
-    def get_row_count(self, table_name: str) -> int:
+    def get_row_count(self, table_name: str, exact: bool = True) -> int:
         """
         Get the number of rows in a table.
 
         Args:
             table_name: Name of the table
+            exact: Pass False to allow the ANALYZE-based estimate from
+                sqlite_stat1, which skips the full COUNT(*) scan
 
         Returns:
             Number of rows
         """
-        query = f"SELECT COUNT(*) as count FROM {table_name}"
-        result = self.execute_query(query)
+        if not exact:
+            approx = self.get_approx_row_count(table_name)
+            if approx is not None:
+                return approx
+
+        result = self.execute_query(_row_count_sql(table_name))
         return result[0]['count'] if result else 0
 
+    def get_approx_row_count(self, table_name: str) -> Optional[int]:
+        """
+        Get the row estimate recorded by ANALYZE in sqlite_stat1.
+        An O(1) metadata read instead of a full B-tree scan.
+
+        Args:
+            table_name: Name of the table
+
+        Returns:
+            Estimated row count, or None if no statistics are available
+        """
+        try:
+            # ANALYZE writes one row per index (idx set) and one for the
+            # table itself only when it has no indexes, but the first
+            # integer of stat is the table row count in every row, so
+            # any row for this table will do
+            results = self.execute_query(
+                "SELECT stat FROM sqlite_stat1 WHERE tbl = ?",
+                (table_name,)
+            )
+        except sqlite3.OperationalError:
+            return None  # ANALYZE has never run; sqlite_stat1 doesn't exist
+
+        if results:
+            try:
+                return int(results[0]['stat'].split()[0])
+            except (AttributeError, IndexError, ValueError):
+                return None
+        return None
+
+    def get_row_counts(self, tables: list) -> dict:
+        """
+        Get row counts for several tables, preferring the ANALYZE
+        estimates in sqlite_stat1 (one metadata read covers every
+        analyzed table) and falling back to a COUNT(*) UNION ALL scan
+        only for tables without statistics.
+
+        Args:
+            tables: List of table names (from sqlite_master, not user input)
+
+        Returns:
+            Dict mapping table name to (possibly estimated) row count
+        """
+        counts = dict.fromkeys(tables, 0)
+        if not tables:
+            return counts
+
+        try:
+            stat_rows = self.execute_query("SELECT tbl, stat FROM sqlite_stat1")
+        except sqlite3.OperationalError:
+            stat_rows = []  # ANALYZE has never run
+
+        wanted = set(tables)
+        analyzed = set()
+        for row in stat_rows:
+            tbl = row['tbl']
+            if tbl not in wanted or tbl in analyzed:
+                continue
+            try:
+                counts[tbl] = int(row['stat'].split()[0])
+            except (AttributeError, IndexError, ValueError):
+                continue
+            analyzed.add(tbl)
+
+        missing = [t for t in tables if t not in analyzed]
+        if missing:
+            union = " UNION ALL ".join(
+                f"SELECT '{table}' AS tbl, COUNT(*) AS cnt FROM {table}"
+                for table in missing
+            )
+            counts.update(
+                (row['tbl'], row['cnt']) for row in self.execute_query(union)
+            )
+
+        return counts
+
 
 # Global instance
 _db_instance: Optional[DatabaseConnection] = None
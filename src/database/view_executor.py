@@ -2,15 +2,28 @@
 View DDL executor - creates and manages SQL views on behalf of agents.
 """
 
+import functools
 import logging
 import re
+import sqlite3
+from collections import OrderedDict
 from typing import Optional, Dict
 
-from .connection import DatabaseConnection, get_db
+from .connection import DatabaseConnection, get_db, validate_identifier
 
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=512)
+def _view_select_sql(view_name: str) -> str:
+    return f'SELECT * FROM "{validate_identifier(view_name)}"'
+
+
+@functools.lru_cache(maxsize=512)
+def _drop_view_sql(view_name: str) -> str:
+    return f'DROP VIEW IF EXISTS "{validate_identifier(view_name)}"'
+
+
 class ViewExecutor:
     """
     Executes and validates view DDL statements.
@@ -32,6 +45,27 @@ class ViewExecutor:
         r'\bUPDATE\b',                    # No UPDATE in view def
         r'\bINSERT\b',                    # No INSERT in view def
     ]
+    DANGEROUS_PATTERNS = [
+        r';\s*DROP',
+        r';\s*DELETE',
+        r'--.*DROP',
+        r'/\*.*DROP.*\*/',
+    ]
+
+    # All patterns fused into one precompiled alternation so validation
+    # makes a single scan over the DDL. Each alternative is a zero-width
+    # lookahead, so one pattern matching cannot shadow another.
+    _PATTERN_GROUPS = (
+        [(f'b{i}', p) for i, p in enumerate(BLOCKED_PATTERNS)]
+        + [(f'd{i}', p) for i, p in enumerate(DANGEROUS_PATTERNS)]
+    )
+    _SCAN_RE = re.compile(
+        "|".join(f"(?=(?P<{g}>{p}))" for g, p in _PATTERN_GROUPS),
+        re.IGNORECASE
+    )
+    _VIEW_NAME_RE = re.compile(
+        r'CREATE\s+(?:OR\s+REPLACE\s+)?VIEW\s+(\w+)', re.IGNORECASE
+    )
 
     def __init__(self, db: Optional[DatabaseConnection] = None):
         """
@@ -42,6 +76,11 @@ class ViewExecutor:
         """
         self.db = db or get_db()
 
+        # Memoized validation results: test_view -> create_view replays
+        # the same DDL, and agents retry identical statements
+        self._validation_cache: "OrderedDict[str, Dict[str, any]]" = OrderedDict()
+        self._validation_cache_size = 256
+
     def validate_view_ddl(self, ddl: str) -> Dict[str, any]:
         """
         Validate view DDL before execution.
@@ -57,24 +96,41 @@ class ViewExecutor:
                     'view_name': str (if parseable)
                 }
         """
+        cached = self._validation_cache.get(ddl)
+        if cached is not None:
+            self._validation_cache.move_to_end(ddl)
+            return cached
+
         errors = []
         view_name = None
 
-        # Check if it starts with allowed statement
-        ddl_upper = ddl.upper().strip()
-        if not any(ddl_upper.startswith(stmt) for stmt in self.ALLOWED_STATEMENTS):
+        # Check if it starts with allowed statement: uppercase only a
+        # bounded prefix instead of the whole (possibly large) DDL.
+        # Anything that is not a CREATE VIEW at all is rejected here
+        # without paying for the pattern scan below.
+        head = ddl.lstrip()[:32].upper()
+        if not any(head.startswith(stmt) for stmt in self.ALLOWED_STATEMENTS):
             errors.append(f"DDL must start with one of: {self.ALLOWED_STATEMENTS}")
+            return self._cache_validation(ddl, {
+                'valid': False,
+                'errors': errors,
+                'view_name': None
+            })
 
         # Extract view name
-        view_name_match = re.search(r'CREATE\s+(?:OR\s+REPLACE\s+)?VIEW\s+(\w+)', ddl, re.IGNORECASE)
+        view_name_match = self._VIEW_NAME_RE.search(ddl)
         if view_name_match:
             view_name = view_name_match.group(1)
         else:
             errors.append("Could not extract view name from DDL")
 
+        # One fused pass over the DDL finds every blocked and dangerous
+        # pattern that fires
+        fired = {match.lastgroup for match in self._SCAN_RE.finditer(ddl)}
+
         # Check for blocked patterns
-        for pattern in self.BLOCKED_PATTERNS:
-            if re.search(pattern, ddl, re.IGNORECASE):
+        for group, pattern in self._PATTERN_GROUPS:
+            if group in fired and group[0] == 'b':
                 errors.append(f"Blocked pattern found: {pattern}")
 
         # Check view naming convention
@@ -82,21 +138,22 @@ class ViewExecutor:
             errors.append(f"View name must start with 'v_': {view_name}")
 
         # Check for SQL injection patterns
-        dangerous_patterns = [
-            r';\s*DROP',
-            r';\s*DELETE',
-            r'--.*DROP',
-            r'/\*.*DROP.*\*/',
-        ]
-        for pattern in dangerous_patterns:
-            if re.search(pattern, ddl, re.IGNORECASE):
+        for group, pattern in self._PATTERN_GROUPS:
+            if group in fired and group[0] == 'd':
                 errors.append(f"Dangerous SQL pattern detected: {pattern}")
 
-        return {
+        return self._cache_validation(ddl, {
             'valid': len(errors) == 0,
             'errors': errors,
             'view_name': view_name
-        }
+        })
+
+    def _cache_validation(self, ddl: str, result: Dict[str, any]) -> Dict[str, any]:
+        """Store a validation result in the bounded LRU and return it."""
+        self._validation_cache[ddl] = result
+        if len(self._validation_cache) > self._validation_cache_size:
+            self._validation_cache.popitem(last=False)
+        return result
 
     def create_view(self, ddl: str, force: bool = False) -> Dict[str, any]:
         """
@@ -159,7 +216,7 @@ class ViewExecutor:
             True if successful, False otherwise
         """
         try:
-            self.db.execute_update(f"DROP VIEW IF EXISTS {view_name}")
+            self.db.execute_update(_drop_view_sql(view_name))
             logger.info(f"View dropped: {view_name}")
             return True
         except Exception as e:
@@ -186,25 +243,45 @@ class ViewExecutor:
             return results[0]['sql']
         return None
 
-    def query_view(self, view_name: str, limit: Optional[int] = None) -> list:
+    def query_view(self, view_name: str, limit: Optional[int] = None, iterator: bool = False):
         """
         Execute a SELECT query on a view.
 
         Args:
             view_name: Name of the view
             limit: Optional row limit
+            iterator: If True, return a row iterator (fetched in chunks)
+                instead of materializing the full result list
 
         Returns:
-            List of Row objects
-        """
-        if not self.db.view_exists(view_name):
-            raise ValueError(f"View does not exist: {view_name}")
+            List of Row objects, or a row iterator if iterator=True
 
-        query = f"SELECT * FROM {view_name}"
-        if limit:
-            query += f" LIMIT {limit}"
+        Raises:
+            ValueError: If the view does not exist
+        """
+        # No existence pre-check: run the SELECT directly and map the
+        # "no such table" error, saving a round-trip per read. LIMIT is
+        # a bound parameter (-1 = unlimited) so the statement text stays
+        # cache-friendly for any limit.
+        query = _view_select_sql(view_name) + " LIMIT ?"
+        params = (int(limit) if limit else -1,)
+
+        if iterator:
+            def _rows():
+                try:
+                    yield from self.db.iter_query(query, params)
+                except sqlite3.OperationalError as e:
+                    if 'no such' in str(e):
+                        raise ValueError(f"View does not exist: {view_name}") from None
+                    raise
+            return _rows()
 
-        return self.db.execute_query(query)
+        try:
+            return self.db.execute_query(query, params)
+        except sqlite3.OperationalError as e:
+            if 'no such' in str(e):
+                raise ValueError(f"View does not exist: {view_name}") from None
+            raise
 
     def test_view(self, ddl: str) -> Dict[str, any]:
         """
@@ -252,12 +329,12 @@ class ViewExecutor:
         Returns:
             List of column names
         """
+        if not re.fullmatch(r'\w+', view_name):
+            raise ValueError(f"Invalid view name: {view_name}")
+
         if not self.db.view_exists(view_name):
             raise ValueError(f"View does not exist: {view_name}")
 
-        # Query with LIMIT 0 to get column info without data
-        query = f"SELECT * FROM {view_name} LIMIT 0"
-        with self.db.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(query)
-            return [description[0] for description in cursor.description]
+        # PRAGMA table_info reads column metadata directly, without
+        # compiling the view's SELECT plan like a LIMIT 0 query would
+        return [row['name'] for row in self.db.execute_query(f"PRAGMA table_info({view_name})")]
@@ -0,0 +1,109 @@
+"""
+Traversal kernels over the SchemaGraph CSR arrays.
+
+These operate only on primitive ints and NumPy arrays (no dicts, no
+graph objects), so they are ready for numba's @njit(cache=True) should
+it become a dependency; today they run as plain Python, which is still
+faster than the dict-of-dicts traversal they replaced because all state
+lives in flat arrays.
+"""
+
+import numpy as np
+
+
+def bfs_reachable(
+    indptr: np.ndarray,
+    indices: np.ndarray,
+    src_id: int,
+    max_depth: int
+) -> np.ndarray:
+    """
+    Node ids reachable from src_id within max_depth hops (src excluded).
+
+    Args:
+        indptr: CSR row pointers, int32[N+1]
+        indices: CSR neighbor ids, int32[2E]
+        src_id: Starting node id
+        max_depth: Maximum hop distance
+
+    Returns:
+        int array of reachable node ids
+    """
+    n = indptr.shape[0] - 1
+    visited = np.zeros(n, dtype=np.bool_)
+    visited[src_id] = True
+
+    # Flat-array queue: each node is enqueued at most once
+    queue = np.empty(n, dtype=np.int32)
+    depths = np.empty(n, dtype=np.int32)
+    queue[0] = src_id
+    depths[0] = 0
+    head = 0
+    tail = 1
+
+    while head < tail:
+        node = queue[head]
+        depth = depths[head]
+        head += 1
+
+        if depth >= max_depth:
+            continue
+
+        for j in range(indptr[node], indptr[node + 1]):
+            neighbor = indices[j]
+            if not visited[neighbor]:
+                visited[neighbor] = True
+                queue[tail] = neighbor
+                depths[tail] = depth + 1
+                tail += 1
+
+    visited[src_id] = False
+    return np.flatnonzero(visited)
+
+
+def dijkstra_pair(
+    indptr: np.ndarray,
+    indices: np.ndarray,
+    weights: np.ndarray,
+    src_id: int,
+    dst_id: int
+) -> float:
+    """
+    Minimum path weight from src_id to dst_id over the CSR arrays.
+
+    Array-based extract-min (O(V^2 + E)): no heap allocation, which is
+    the right trade for schema-sized graphs and keeps the loop
+    njit-compatible.
+
+    Args:
+        indptr: CSR row pointers, int32[N+1]
+        indices: CSR neighbor ids, int32[2E]
+        weights: CSR edge weights, float32[2E]
+        src_id: Source node id
+        dst_id: Destination node id
+
+    Returns:
+        Total path weight, or inf if unreachable
+    """
+    n = indptr.shape[0] - 1
+    dist = np.full(n, np.inf)
+    dist[src_id] = 0.0
+    done = np.zeros(n, dtype=np.bool_)
+
+    while True:
+        node = -1
+        best = np.inf
+        for i in range(n):
+            if not done[i] and dist[i] < best:
+                best = dist[i]
+                node = i
+
+        if node == -1 or node == dst_id:
+            return float(dist[dst_id])
+
+        done[node] = True
+        for j in range(indptr[node], indptr[node + 1]):
+            neighbor = indices[j]
+            relaxed = best + weights[j]
+            if relaxed < dist[neighbor]:
+                dist[neighbor] = relaxed
@@ -3,15 +3,67 @@ Schema graph construction using NetworkX.
 Builds a graph representation of database tables and foreign key relationships.
 """
 
+import hashlib
 import logging
+import pickle
+import sys
+from pathlib import Path
+
 import networkx as nx
+import numpy as np
 from typing import List, Dict, Any, Optional, Tuple
 
+from ._kernels import bfs_reachable, dijkstra_pair
 from ..database.connection import DatabaseConnection, get_db
 
 logger = logging.getLogger(__name__)
 
 
+def cached_spring_layout(
+    graph: nx.Graph,
+    k: float = 2,
+    iterations: int = 50,
+    cache_dir: str = ".cache"
+) -> dict:
+    """
+    Seeded spring layout memoized on disk, keyed by graph structure.
+
+    The 50-iteration relaxation dominates visualization time but the
+    schema rarely changes, so positions are pickled under
+    `.cache/schema_layout_<hash>.pkl` and reloaded on later calls (or
+    later processes) for the same node/edge sets.
+
+    Args:
+        graph: Graph to lay out
+        k: Optimal node distance passed to spring_layout
+        iterations: Relaxation iterations on cache miss
+        cache_dir: Directory for the pickled positions
+
+    Returns:
+        Dict of node -> position
+    """
+    payload = repr((sorted(graph.nodes), sorted(graph.edges()))).encode()
+    signature = hashlib.sha256(payload).hexdigest()[:16]
+    cache_file = Path(cache_dir) / f"schema_layout_{signature}.pkl"
+
+    try:
+        with open(cache_file, 'rb') as f:
+            return pickle.load(f)
+    except (OSError, pickle.PickleError):
+        pass
+
+    pos = nx.spring_layout(graph, k=k, iterations=iterations, seed=42)
+
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(cache_file, 'wb') as f:
+            pickle.dump(pos, f)
+    except OSError:
+        logger.debug("Could not write layout cache: %s", cache_file)
+
+    return pos
+
+
 class SchemaGraph:
     """
     Represents the database schema as a directed graph.
@@ -28,6 +80,32 @@ class SchemaGraph:
         self.db = db or get_db()
         self.graph = nx.DiGraph()
         self._built = False
+        # Bumps on every rebuild so derived-structure caches (e.g. the
+        # solver's unified graph) can key on it
+        self.version = 0
+
+        # CSR adjacency arrays (undirected, both FK directions baked in),
+        # rebuilt by build_from_database. Traversal queries run on these
+        # flat arrays instead of the NetworkX dict-of-dicts; the DiGraph
+        # is kept for node/edge attributes, visualization and the
+        # Steiner solver.
+        self._node_ids: Dict[str, int] = {}
+        self._node_names: List[str] = []
+        self._indptr: Optional[np.ndarray] = None
+        self._indices: Optional[np.ndarray] = None
+        self._weights: Optional[np.ndarray] = None
+        self._row_counts_np: Optional[np.ndarray] = None
+        self._degrees_np: Optional[np.ndarray] = None
+
+        # Lazily built undirected view of the graph (a view, not a copy)
+        self._undirected: Optional[nx.Graph] = None
+
+        # Join costs memoized per unordered table pair; bounded by V^2
+        # and dropped on rebuild
+        self._join_cost_cache: Dict[Tuple[str, str], float] = {}
+
+        # Cached spring layout: (graph signature, positions)
+        self._pos_cache: Optional[Tuple[Tuple[int, int], dict]] = None
 
     def build_from_database(self) -> nx.DiGraph:
         """
@@ -41,43 +119,48 @@ class SchemaGraph:
         # Clear existing graph
         self.graph.clear()
 
-        # Get all tables
-        tables = self.db.get_all_tables()
-        logger.debug(f"Found {len(tables)} tables")
+        # One batched introspection pass: row counts, columns and FKs
+        # for every table arrive in three queries total instead of three
+        # round trips per table
+        row_counts, columns_by_table, fks_by_table = self.db.get_all_schema_metadata()
+        # Intern the names once at ingest: every later dict/graph lookup
+        # keyed by a table name then compares by pointer instead of
+        # re-hashing the string
+        tables = [sys.intern(table) for table in row_counts]
+        logger.debug("Found %d tables", len(tables))
 
         # Add table nodes
         for table in tables:
-            row_count = self.db.get_row_count(table)
-            columns = self.db.get_table_info(table)
+            columns = columns_by_table[table]
 
             self.graph.add_node(
                 table,
                 type='table',
-                row_count=row_count,
+                row_count=row_counts[table],
                 columns=[col['name'] for col in columns],
                 column_count=len(columns)
             )
 
+        # Weight normalizer, computed once (not per foreign key)
+        max_rows = max(row_counts.values(), default=0)
+
         # Add foreign key edges
         edge_count = 0
         for table in tables:
-            fks = self.db.get_foreign_keys(table)
-
-            for fk in fks:
+            for fk in fks_by_table[table]:
                 # Foreign key goes FROM this table TO referenced table
                 from_table = table
-                to_table = fk['table']
+                to_table = sys.intern(fk['table'])
                 from_column = fk['from']
                 to_column = fk['to']
 
                 # Calculate edge weight (based on table sizes)
-                # Larger tables = higher cost to join
-                from_row_count = self.graph.nodes[from_table]['row_count']
-                to_row_count = self.graph.nodes[to_table]['row_count']
-
-                # Weight formula: normalized by max table size
-                max_rows = max(self.graph.nodes[n]['row_count'] for n in self.graph.nodes)
-                weight = (from_row_count + to_row_count) / (2 * max_rows) if max_rows > 0 else 1.0
+                # Larger tables = higher cost to join, normalized by the
+                # largest table
+                weight = (
+                    (row_counts[from_table] + row_counts[to_table]) / (2 * max_rows)
+                    if max_rows > 0 else 1.0
+                )
 
                 self.graph.add_edge(
                     from_table,
@@ -90,11 +173,141 @@ class SchemaGraph:
 
                 edge_count += 1
 
+        self._build_csr()
+        self._undirected = None
+        self._join_cost_cache.clear()
+        self._pos_cache = None
+        self.version += 1
+
         self._built = True
         logger.info(f"Schema graph built: {len(tables)} nodes, {edge_count} edges")
 
         return self.graph
 
+    def _build_csr(self) -> None:
+        """
+        Build CSR adjacency arrays from the current graph.
+        Each FK edge is stored in both directions, so the arrays are
+        already the undirected view the traversal queries need.
+        """
+        names = list(self.graph.nodes)
+        self._node_names = names
+        self._node_ids = {name: i for i, name in enumerate(names)}
+        n = len(names)
+
+        src = []
+        dst = []
+        wts = []
+        for u, v, data in self.graph.edges(data=True):
+            u_id, v_id = self._node_ids[u], self._node_ids[v]
+            weight = data.get('weight', 1.0)
+            src.extend((u_id, v_id))
+            dst.extend((v_id, u_id))
+            wts.extend((weight, weight))
+
+        src_arr = np.asarray(src, dtype=np.int32)
+        order = np.argsort(src_arr, kind='stable')
+
+        self._indptr = np.zeros(n + 1, dtype=np.int32)
+        np.cumsum(np.bincount(src_arr, minlength=n), out=self._indptr[1:])
+        self._indices = np.asarray(dst, dtype=np.int32)[order]
+        self._weights = np.asarray(wts, dtype=np.float32)[order]
+
+        # Per-node stats arrays (node order matches _node_names); the
+        # CSR row length of a node is exactly its in+out degree
+        self._row_counts_np = np.array(
+            [self.graph.nodes[name].get('row_count', 0) for name in names],
+            dtype=np.int64
+        )
+        self._degrees_np = np.diff(self._indptr)
+
+    def get_undirected(self) -> nx.Graph:
+        """
+        Undirected view of the schema graph, cached across calls.
+        Built with as_view=True, so it shares storage with self.graph
+        instead of copying the dict-of-dicts on every consumer call.
+        """
+        if self._undirected is None:
+            self._undirected = self.graph.to_undirected(as_view=True)
+        return self._undirected
+
+    def _neighbor_ids(self, node_id: int) -> np.ndarray:
+        """Neighbor id slice for a node (a view into the CSR arrays)."""
+        return self._indices[self._indptr[node_id]:self._indptr[node_id + 1]]
+
+    def _edge_weight(self, u_id: int, v_id: int) -> Optional[float]:
+        """Weight of the edge u->v in the CSR arrays, or None if absent."""
+        start, end = self._indptr[u_id], self._indptr[u_id + 1]
+        hits = np.flatnonzero(self._indices[start:end] == v_id)
+        if hits.size == 0:
+            return None
+        return float(self._weights[start + hits[0]])
+
+    def _csr_path(self, src_id: int, dst_id: int) -> Optional[List[int]]:
+        """
+        Shortest (fewest-hop) path between two node ids via
+        bidirectional BFS over the CSR arrays: both endpoints expand
+        toward each other, always growing the smaller frontier, so only
+        O(2*b^(d/2)) nodes are visited instead of O(b^d).
+
+        Returns the path as a list of ids, or None.
+        """
+        if src_id == dst_id:
+            return [src_id]
+
+        pred_fwd = {src_id: -1}
+        pred_bwd = {dst_id: -1}
+        frontier_fwd = [src_id]
+        frontier_bwd = [dst_id]
+
+        while frontier_fwd and frontier_bwd:
+            forward = len(frontier_fwd) <= len(frontier_bwd)
+            frontier = frontier_fwd if forward else frontier_bwd
+            pred = pred_fwd if forward else pred_bwd
+            other = pred_bwd if forward else pred_fwd
+
+            next_frontier = []
+            for node in frontier:
+                for neighbor in self._neighbor_ids(node):
+                    neighbor = int(neighbor)
+                    if neighbor in pred:
+                        continue
+                    pred[neighbor] = node
+
+                    if neighbor in other:
+                        # Frontiers met: stitch both halves together
+                        return self._join_paths(neighbor, pred_fwd, pred_bwd)
+
+                    next_frontier.append(neighbor)
+
+            if forward:
+                frontier_fwd = next_frontier
+            else:
+                frontier_bwd = next_frontier
+
+        return None
+
+    @staticmethod
+    def _join_paths(
+        meet_id: int,
+        pred_fwd: Dict[int, int],
+        pred_bwd: Dict[int, int]
+    ) -> List[int]:
+        """Assemble a full path from the two BFS halves meeting at meet_id."""
+        path = []
+        node = meet_id
+        while node != -1:
+            path.append(node)
+            node = pred_fwd[node]
+        path.reverse()
+
+        node = pred_bwd[meet_id]
+        while node != -1:
+            path.append(node)
+            node = pred_bwd[node]
+
+        return path
+
     def get_table_info(self, table_name: str) -> Dict[str, Any]:
         """
         Get information about a table node.
@@ -132,9 +345,12 @@ class SchemaGraph:
 
         fks = []
 
+        # Read through the internal _adj/_pred dicts directly: the
+        # public accessors wrap every lookup in a read-only view, which
+        # costs ~3x a plain dict access on this hot path. Reads only --
+        # mutation still goes through the public API.
         # Outgoing edges (this table references other tables)
-        for successor in self.graph.successors(table_name):
-            edge_data = self.graph[table_name][successor]
+        for successor, edge_data in self.graph._adj[table_name].items():
             if edge_data.get('type') == 'fk':
                 fks.append({
                     'from_table': table_name,
@@ -145,8 +361,7 @@ class SchemaGraph:
                 })
 
         # Incoming edges (other tables reference this table)
-        for predecessor in self.graph.predecessors(table_name):
-            edge_data = self.graph[predecessor][table_name]
+        for predecessor, edge_data in self.graph._pred[table_name].items():
             if edge_data.get('type') == 'fk':
                 fks.append({
                     'from_table': predecessor,
@@ -169,25 +384,30 @@ class SchemaGraph:
         Returns:
             List of table names in path, or None if no path exists
         """
-        # Convert to undirected for pathfinding (FK can be traversed both ways)
-        undirected = self.graph.to_undirected()
+        # CSR arrays already hold both FK directions, so no undirected
+        # copy is needed
+        if source not in self._node_ids or target not in self._node_ids:
+            raise ValueError(f"Table not in graph: {source if source not in self._node_ids else target}")
 
-        try:
-            path = nx.shortest_path(undirected, source, target)
-            return path
-        except nx.NetworkXNoPath:
+        path_ids = self._csr_path(self._node_ids[source], self._node_ids[target])
+        if path_ids is None:
             logger.warning(f"No path found between {source} and {target}")
             return None
 
-    def get_subgraph(self, tables: List[str]) -> nx.DiGraph:
+        return [self._node_names[i] for i in path_ids]
+
+    def get_subgraph(self, tables: List[str], copy: bool = False) -> nx.DiGraph:
         """
         Extract a subgraph containing only specified tables and their connections.
 
         Args:
             tables: List of table names
+            copy: Return an independent copy instead of a read-only
+                view. The default view shares storage with the schema
+                graph; pass copy=True if the result will be mutated.
 
         Returns:
-            NetworkX DiGraph subgraph
+            NetworkX DiGraph subgraph (view unless copy=True)
         """
         # Get all nodes that exist in the graph
         valid_tables = [t for t in tables if t in self.graph]
@@ -196,9 +416,9 @@ class SchemaGraph:
             return nx.DiGraph()
 
         # Create subgraph
-        subgraph = self.graph.subgraph(valid_tables).copy()
+        subgraph = self.graph.subgraph(valid_tables)
 
-        return subgraph
+        return subgraph.copy() if copy else subgraph
 
     def get_connected_tables(
         self,
@@ -215,33 +435,12 @@ class SchemaGraph:
         Returns:
             List of connected table names
         """
-        if table_name not in self.graph:
+        if table_name not in self._node_ids:
             return []
 
-        # Convert to undirected for traversal
-        undirected = self.graph.to_undirected()
-
-        # BFS to find all reachable tables
-        connected = set()
-        visited = set()
-        queue = [(table_name, 0)]
-
-        while queue:
-            current, depth = queue.pop(0)
-
-            if current in visited or depth > max_depth:
-                continue
-
-            visited.add(current)
-            connected.add(current)
-
-            # Add neighbors
-            for neighbor in undirected.neighbors(current):
-                if neighbor not in visited:
-                    queue.append((neighbor, depth + 1))
-
-        connected.discard(table_name)  # Remove starting table
-        return list(connected)
+        start = self._node_ids[table_name]
+        reachable = bfs_reachable(self._indptr, self._indices, start, max_depth)
+        return [self._node_names[i] for i in reachable]
 
     def calculate_join_cost(self, table1: str, table2: str) -> float:
         """
@@ -254,39 +453,30 @@ class SchemaGraph:
         Returns:
             Join cost (lower is better)
         """
-        if table1 not in self.graph or table2 not in self.graph:
+        if table1 not in self._node_ids or table2 not in self._node_ids:
             return float('inf')
 
-        # If directly connected, use edge weight
-        if self.graph.has_edge(table1, table2):
-            return self.graph[table1][table2].get('weight', 1.0)
-
-        if self.graph.has_edge(table2, table1):
-            return self.graph[table2][table1].get('weight', 1.0)
-
-        # Otherwise, find shortest path and sum weights
-        undirected = self.graph.to_undirected()
+        # Cost is symmetric, so memoize on the unordered pair
+        key = (table1, table2) if table1 <= table2 else (table2, table1)
+        cached = self._join_cost_cache.get(key)
+        if cached is not None:
+            return cached
 
-        try:
-            path = nx.shortest_path(undirected, table1, table2)
-            total_cost = 0.0
+        t1_id = self._node_ids[table1]
+        t2_id = self._node_ids[table2]
 
-            for i in range(len(path) - 1):
-                from_node = path[i]
-                to_node = path[i + 1]
+        # If directly connected, use edge weight (CSR holds both directions)
+        total_cost = self._edge_weight(t1_id, t2_id)
 
-                # Get weight from either direction
-                if self.graph.has_edge(from_node, to_node):
-                    total_cost += self.graph[from_node][to_node].get('weight', 1.0)
-                elif self.graph.has_edge(to_node, from_node):
-                    total_cost += self.graph[to_node][from_node].get('weight', 1.0)
-                else:
-                    total_cost += 1.0
-
-            return total_cost
+        if total_cost is None:
+            # Otherwise, minimum total path weight via the Dijkstra
+            # kernel (inf when unreachable)
+            total_cost = dijkstra_pair(
+                self._indptr, self._indices, self._weights, t1_id, t2_id
+            )
 
-        except nx.NetworkXNoPath:
-            return float('inf')
+        self._join_cost_cache[key] = total_cost
+        return total_cost
 
     def get_statistics(self) -> Dict[str, Any]:
         """
@@ -298,17 +488,16 @@ class SchemaGraph:
         if not self._built:
             return {'error': 'Graph not built yet'}
 
+        # Degree and row-count aggregates come from the stats arrays
+        # built alongside the CSR -- C-level reductions instead of a
+        # dict lookup per node
         return {
             'num_tables': self.graph.number_of_nodes(),
             'num_foreign_keys': self.graph.number_of_edges(),
             'is_connected': nx.is_weakly_connected(self.graph),
             'num_components': nx.number_weakly_connected_components(self.graph),
-            'avg_degree': sum(dict(self.graph.degree()).values()) / self.graph.number_of_nodes()
-            if self.graph.number_of_nodes() > 0 else 0,
-            'total_rows': sum(
-                self.graph.nodes[n].get('row_count', 0)
-                for n in self.graph.nodes
-            )
+            'avg_degree': float(self._degrees_np.mean()) if self._degrees_np.size > 0 else 0,
+            'total_rows': int(self._row_counts_np.sum())
         }
 
     def visualize(self, output_file: Optional[str] = None):
@@ -326,14 +515,18 @@ class SchemaGraph:
 
         plt.figure(figsize=(14, 10))
 
-        # Use spring layout for better visualization
-        pos = nx.spring_layout(self.graph, k=2, iterations=50)
-
-        # Draw nodes
-        node_sizes = [
-            self.graph.nodes[n].get('row_count', 100) * 10
-            for n in self.graph.nodes
-        ]
+        # Seeded spring layout for reproducible output; in-memory cache
+        # while the graph shape is unchanged, disk cache across
+        # processes (the 50-iteration layout dominates visualize time)
+        signature = (self.graph.number_of_nodes(), self.graph.number_of_edges())
+        if self._pos_cache is None or self._pos_cache[0] != signature:
+            pos = cached_spring_layout(self.graph, k=2, iterations=50)
+            self._pos_cache = (signature, pos)
+        pos = self._pos_cache[1]
+
+        # Node sizes straight from the per-node row-count array (same
+        # node order as the graph)
+        node_sizes = (self._row_counts_np * 10).tolist()
 
         nx.draw_networkx_nodes(
             self.graph,
@@ -4,17 +4,138 @@ Finds the minimal set of tables/views needed to answer a query.
 Views act as shortcut edges with zero weight, making them preferred over raw table joins.
 """
 
+import heapq
 import logging
+from collections import Counter
+
 import networkx as nx
-from typing import List, Dict, Any, Optional, Set
+from typing import List, Dict, Any, Optional, Set, Tuple
 
-from .schema_graph import SchemaGraph
+from .schema_graph import SchemaGraph, cached_spring_layout
 from ..catalog.view_catalog import ViewCatalog
 from ..catalog.models import ViewMetadata
 
 logger = logging.getLogger(__name__)
 
 
+def _dijkstra_paths(graph: nx.Graph, source: str) -> Tuple[Dict[str, float], Dict[str, str]]:
+    """
+    Single-source Dijkstra over a NetworkX graph using a heapq frontier.
+
+    Returns:
+        Tuple of (dist, pred) dicts keyed by reachable node
+    """
+    adj = graph.adj
+    dist = {source: 0.0}
+    pred = {source: None}
+    heap = [(0.0, source)]
+
+    while heap:
+        d, node = heapq.heappop(heap)
+        if d > dist[node]:
+            continue  # stale heap entry
+
+        for neighbor, data in adj[node].items():
+            nd = d + data.get('weight', 1.0)
+            if nd < dist.get(neighbor, float('inf')):
+                dist[neighbor] = nd
+                pred[neighbor] = node
+                heapq.heappush(heap, (nd, neighbor))
+
+    return dist, pred
+
+
+def _component_ids(graph: nx.Graph) -> Dict[str, str]:
+    """
+    Component id (a representative node) per node, from a single
+    union-find pass over the edges.
+    """
+    parent = {node: node for node in graph}
+
+    def find(node: str) -> str:
+        root = node
+        while parent[root] != root:
+            root = parent[root]
+        while parent[node] != root:  # path compression
+            parent[node], node = root, parent[node]
+        return root
+
+    for u, v in graph.edges():
+        r_u, r_v = find(u), find(v)
+        if r_u != r_v:
+            parent[r_u] = r_v
+
+    return {node: find(node) for node in graph}
+
+
+def _kmb_steiner_tree(graph: nx.Graph, terminals: List[str]) -> nx.Graph:
+    """
+    Kou-Markowsky-Berman Steiner tree approximation.
+
+    Same algorithm the NetworkX approximation uses, but the metric
+    closure is computed with Dijkstra runs from the terminals only
+    instead of over every node pair, which is the dominant cost for
+    schemas much larger than the terminal set.
+
+    Args:
+        graph: Undirected graph with 'weight' edge attributes
+        terminals: Nodes that must appear in the tree (assumed to share
+            a connected component)
+
+    Returns:
+        Tree as an nx.Graph with node/edge data from `graph`
+    """
+    # Metric closure restricted to the terminals
+    dist_from = {}
+    pred_from = {}
+    for terminal in terminals:
+        dist_from[terminal], pred_from[terminal] = _dijkstra_paths(graph, terminal)
+
+    # Kruskal MST over the terminal-only closure (union-find on ranks)
+    closure_edges = sorted(
+        (dist_from[t1][t2], t1, t2)
+        for i, t1 in enumerate(terminals)
+        for t2 in terminals[i + 1:]
+        if t2 in dist_from[t1]
+    )
+
+    parent = {t: t for t in terminals}
+
+    def find(node: str) -> str:
+        root = node
+        while parent[root] != root:
+            root = parent[root]
+        while parent[node] != root:  # path compression
+            parent[node], node = root, parent[node]
+        return root
+
+    tree_nodes = set(terminals)
+    for _, t1, t2 in closure_edges:
+        r1, r2 = find(t1), find(t2)
+        if r1 == r2:
+            continue
+        parent[r1] = r2
+
+        # Expand the closure edge back into its shortest path
+        node = t2
+        while node is not None:
+            tree_nodes.add(node)
+            node = pred_from[t1][node]
+
+    # MST of the induced subgraph, then prune non-terminal leaves
+    tree = nx.minimum_spanning_tree(graph.subgraph(tree_nodes), weight='weight')
+
+    terminal_set = set(terminals)
+    while True:
+        leaves = [
+            node for node, degree in tree.degree()
+            if degree <= 1 and node not in terminal_set
+        ]
+        if not leaves:
+            return tree
+        tree.remove_nodes_from(leaves)
+
+
 class SteinerTreeSolver:
     """
     Solves the Steiner Tree problem for database query optimization.
@@ -36,6 +157,17 @@ class SteinerTreeSolver:
         self.schema_graph = schema_graph
         self.catalog = catalog
         self.unified_graph = None
+        self._unified_key = None
+
+        # View node names in the unified graph, maintained alongside it
+        # so solution analysis is set membership instead of per-node
+        # attribute reads
+        self._view_nodes: Set[str] = set()
+
+        # compare_solutions results per terminal set (plus the
+        # schema/catalog versions, so writes age entries out). Re-running
+        # the same query skips both Steiner solves entirely.
+        self._compare_cache: Dict[Tuple, Dict[str, Any]] = {}
 
     def solve(
         self,
@@ -74,21 +206,26 @@ class SteinerTreeSolver:
         if use_views and self.catalog:
             graph = self._build_unified_graph()
         else:
-            graph = self.schema_graph.graph.to_undirected()
-
-        # Handle disconnected graphs
-        if not nx.is_connected(graph):
+            # Cached undirected view -- no per-solve graph copy
+            graph = self.schema_graph.get_undirected()
+
+        # Handle disconnected graphs: one union-find pass over the
+        # edges gives a component id per node, replacing the
+        # is_connected + connected_components + max triple traversal.
+        # When all terminals share a component, solve proceeds directly
+        # -- the metric-closure Dijkstra never leaves that component,
+        # so no filtering (or largest-component restriction) is needed.
+        comp_id = _component_ids(graph)
+        terminal_components = {comp_id[t] for t in terminal_tables}
+
+        if len(terminal_components) > 1:
             logger.warning("Graph is disconnected, working with largest connected component")
 
-            # Get largest connected component
-            components = list(nx.connected_components(graph))
-            largest_component = max(components, key=len)
-
-            # Create subgraph with only largest component
-            graph = graph.subgraph(largest_component).copy()
+            # Largest component by node count, from the same id map
+            largest_component = Counter(comp_id.values()).most_common(1)[0][0]
 
             # Filter terminals to those in this component
-            valid_terminals = [t for t in terminal_tables if t in graph]
+            valid_terminals = [t for t in terminal_tables if comp_id[t] == largest_component]
 
             if len(valid_terminals) < len(terminal_tables):
                 removed = set(terminal_tables) - set(valid_terminals)
@@ -104,13 +241,10 @@ class SteinerTreeSolver:
 
             terminal_tables = valid_terminals
 
-        # Run Steiner Tree approximation
+        # Run Steiner Tree approximation (KMB with terminal-only
+        # metric closure; see _kmb_steiner_tree)
         try:
-            steiner_tree = nx.algorithms.approximation.steiner_tree(
-                graph,
-                terminal_tables,
-                weight='weight'
-            )
+            steiner_tree = _kmb_steiner_tree(graph, terminal_tables)
 
             # Analyze solution
             return self._analyze_solution(steiner_tree, terminal_tables, use_views)
@@ -127,16 +261,25 @@ class SteinerTreeSolver:
         Returns:
             NetworkX undirected graph
         """
+        # Reuse the cached unified graph while neither the schema graph
+        # nor the catalog has changed; repeated solve() calls
+        # (compare_solutions, agent flows) would otherwise rebuild it
+        # every time
+        key = (self.schema_graph.version, self.catalog.version)
+        if self.unified_graph is not None and self._unified_key == key:
+            return self.unified_graph
+
         logger.debug("Building unified graph with views...")
 
-        # Start with schema graph (undirected)
+        # Start with schema graph (undirected copy -- view nodes and
+        # edges get added below, so this cannot be a read-only view)
         graph = self.schema_graph.graph.to_undirected()
 
-        # Get all views from catalog
-        views = self.catalog.get_all_views(status='PROMOTED')  # Only use promoted views
-        views.extend(self.catalog.get_all_views(status='MATERIALIZED'))
+        # Only promoted/materialized views qualify; one IN-filtered
+        # query instead of two full catalog scans
+        views = self.catalog.get_all_views(status=['PROMOTED', 'MATERIALIZED'])
 
-        logger.debug(f"Found {len(views)} promoted/materialized views")
+        logger.debug("Found %d promoted/materialized views", len(views))
 
         # Add view nodes and edges
         for view in views:
@@ -161,10 +304,71 @@ class SteinerTreeSolver:
                     )
 
         self.unified_graph = graph
-        logger.debug(f"Unified graph: {graph.number_of_nodes()} nodes, {graph.number_of_edges()} edges")
+        self._unified_key = key
+        self._view_nodes = {view.view_name for view in views}
+        logger.debug(
+            "Unified graph: %d nodes, %d edges",
+            graph.number_of_nodes(), graph.number_of_edges()
+        )
 
         return graph
 
+    def add_view(self, view: ViewMetadata) -> None:
+        """
+        Incrementally add one view to the cached unified graph.
+
+        Creating a single view bumps the catalog version, which would
+        otherwise throw away the whole cached graph and trigger a full
+        rebuild (catalog scan + undirected copy) on the next solve. The
+        topology change is just one node and a handful of zero-weight
+        edges, so patch it in place and re-stamp the cache key.
+
+        Args:
+            view: Metadata of the view just registered/promoted
+        """
+        if self.unified_graph is None:
+            # Nothing cached; the next solve builds from the catalog
+            return
+
+        if view.status in ('PROMOTED', 'MATERIALIZED'):
+            graph = self.unified_graph
+            graph.add_node(
+                view.view_name,
+                type='view',
+                layer=view.layer,
+                domain=view.domain,
+                usage_count=view.usage_count,
+                base_tables=view.base_tables
+            )
+            for table in view.base_tables:
+                if table in graph:
+                    graph.add_edge(
+                        view.view_name,
+                        table,
+                        type='view_dependency',
+                        weight=0.0
+                    )
+            self._view_nodes.add(view.view_name)
+
+        self._unified_key = (self.schema_graph.version, self.catalog.version)
+
+    def remove_view(self, view_name: str) -> None:
+        """
+        Incrementally drop one view from the cached unified graph.
+        Counterpart of add_view for view deletion/demotion.
+
+        Args:
+            view_name: Name of the removed view
+        """
+        if self.unified_graph is None:
+            return
+
+        if view_name in self.unified_graph:
+            self.unified_graph.remove_node(view_name)
+        self._view_nodes.discard(view_name)
+
+        self._unified_key = (self.schema_graph.version, self.catalog.version)
+
     def _analyze_solution(
         self,
         steiner_tree: nx.Graph,
@@ -182,20 +386,17 @@ class SteinerTreeSolver:
         Returns:
             Dict with analysis results
         """
-        # Separate nodes into tables and views
-        tables_in_solution = []
-        views_in_solution = []
-
-        for node in steiner_tree.nodes():
-            node_data = steiner_tree.nodes[node]
-            if node_data.get('type') == 'view':
-                views_in_solution.append(node)
-            else:
-                tables_in_solution.append(node)
+        # Separate nodes into tables and views via the maintained
+        # view-node set: two set operations instead of an attribute
+        # dict read per node
+        nodes = set(steiner_tree._node)
+        views_in_solution = list(nodes & self._view_nodes)
+        tables_in_solution = list(nodes - self._view_nodes)
 
         # Calculate total cost
+        adj = steiner_tree._adj
         total_cost = sum(
-            steiner_tree[u][v].get('weight', 1.0)
+            adj[u][v].get('weight', 1.0)
             for u, v in steiner_tree.edges()
         )
 
@@ -302,6 +503,17 @@ class SteinerTreeSolver:
         """
         logger.info("Comparing solutions with/without views...")
 
+        key = (
+            frozenset(terminal_tables),
+            self.schema_graph.version,
+            self.catalog.version if self.catalog else None
+        )
+        cached = self._compare_cache.get(key)
+        if cached is not None:
+            logger.debug("compare_solutions cache hit for %s", key[0])
+            # Shallow copy so callers cannot mutate the cached entry
+            return dict(cached)
+
         # Solve without views
         solution_without = self.solve(terminal_tables, use_views=False)
 
@@ -316,6 +528,10 @@ class SteinerTreeSolver:
         tables_avoided = len(solution_without['tables_used']) - len(solution_with['tables_used'])
 
         comparison = {
+            # Full solution dicts so callers (e.g. visualize_comparison)
+            # can reuse them instead of re-running the solver
+            'solution_without': solution_without,
+            'solution_with': solution_with,
             'without_views': {
                 'tables': solution_without['tables_used'],
                 'cost': solution_without['total_cost'],
@@ -341,7 +557,8 @@ class SteinerTreeSolver:
             f"{tables_avoided} tables avoided by using views"
         )
 
-        return comparison
+        self._compare_cache[key] = comparison
+        return dict(comparison)
 
     def recommend_views(
         self,
@@ -365,19 +582,35 @@ class SteinerTreeSolver:
         # Find views that cover any of the terminal tables
         relevant_views = self.catalog.find_by_base_tables(terminal_tables)
 
-        # Score views by coverage
+        # Coverage as int bitmasks over the schema's table ids: one
+        # AND + popcount per view instead of building two sets per view
+        table_bit = self.schema_graph._node_ids
+        terminal_mask = 0
+        for table in terminal_tables:
+            bit = table_bit.get(table)
+            if bit is not None:
+                terminal_mask |= 1 << bit
+
         scored_views = []
         for view in relevant_views:
+            view_mask = 0
+            for table in view.base_tables:
+                bit = table_bit.get(table)
+                if bit is not None:
+                    view_mask |= 1 << bit
+
             # How many terminal tables does this view cover?
-            coverage = len(set(view.base_tables) & set(terminal_tables))
+            coverage = (view_mask & terminal_mask).bit_count()
             # Bonus for higher usage (proven useful)
             score = coverage * 10 + view.usage_count
 
             scored_views.append((score, view))
 
-        # Sort by score and return top-k
-        scored_views.sort(key=lambda x: x[0], reverse=True)
-        return [view for score, view in scored_views[:top_k]]
+        # Bounded top-k selection by score
+        return [
+            view for score, view in
+            heapq.nlargest(top_k, scored_views, key=lambda x: x[0])
+        ]
 
     def visualize_comparison(
         self,
@@ -397,12 +630,13 @@ class SteinerTreeSolver:
 
         fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 8))
 
-        # Solve for visualization
-        sol_without = self.solve(terminal_tables, use_views=False)
-        sol_with = self.solve(terminal_tables, use_views=True)
+        # Reuse the solutions computed by compare_solutions instead of
+        # running the Steiner solver twice more
+        sol_without = comparison['solution_without']
+        sol_with = comparison['solution_with']
 
-        # Draw without views
-        pos1 = nx.spring_layout(sol_without['subgraph'], k=2)
+        # Draw without views (layouts memoized on disk per structure)
+        pos1 = cached_spring_layout(sol_without['subgraph'], k=2)
         nx.draw(
             sol_without['subgraph'],
             pos1,
@@ -421,7 +655,7 @@ class SteinerTreeSolver:
         )
 
         # Draw with views
-        pos2 = nx.spring_layout(sol_with['subgraph'], k=2)
+        pos2 = cached_spring_layout(sol_with['subgraph'], k=2)
 
         # Color nodes differently (views vs tables)
         node_colors = []
@@ -4,8 +4,13 @@ Provides helper functions to work with views in the graph context.
 """
 
 import logging
+import re
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional
 
+import numpy as np
+
 from .schema_graph import SchemaGraph
 from .steiner_tree import SteinerTreeSolver
 from ..catalog.view_catalog import ViewCatalog
@@ -14,6 +19,17 @@ from ..catalog.models import ViewMetadata
 
 logger = logging.getLogger(__name__)
 
+# Report banners, built once instead of per print call
+_BANNER = "=" * 70
+_RULE = "-" * 70
+
+# Combined-score weights: semantic, steiner, usage. The usage weight
+# pre-folds the /100 normalization (0.2 / 100) so the ranking is two
+# multiply-adds per view with no division.
+_SEM_W = np.float32(0.5)
+_ST_W = np.float32(0.3)
+_USAGE_W = np.float32(0.002)
+
 
 class ViewIntegration:
     """
@@ -21,6 +37,11 @@ class ViewIntegration:
     Helps agents discover and utilize views for optimal query execution.
     """
 
+    # Shared pool for overlapping the semantic search (model inference,
+    # releases the GIL) with the Steiner recommendation (catalog query +
+    # bitmask scoring). Class-level so instances reuse the same threads.
+    _executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='view-integration')
+
     def __init__(
         self,
         schema_graph: SchemaGraph,
@@ -40,6 +61,22 @@ class ViewIntegration:
         self.semantic_search = semantic_search or SemanticSearch(catalog)
         self.steiner_solver = SteinerTreeSolver(schema_graph, catalog)
 
+        # Result cache for find_optimal_views, keyed by terminal set
+        # plus the schema/catalog versions (stale entries age out on
+        # any write). Each entry holds (unit query embedding, result);
+        # a near-duplicate query reuses the previous ranking when its
+        # cosine similarity clears the threshold.
+        self._semantic_cache: OrderedDict = OrderedDict()
+        self._semantic_cache_size = 512
+        # Each entry holds full results (including NetworkX subgraphs),
+        # so the per-key list is capped too: oldest query out first
+        self._semantic_entries_per_key = 8
+        self._semantic_threshold = 0.95
+
+        # Next free suffix per suggested base name: the catalog is
+        # probed once per base, later suggestions are O(1) increments
+        self._name_counters: Dict[str, int] = {}
+
     def find_optimal_views(
         self,
         query: str,
@@ -58,18 +95,40 @@ class ViewIntegration:
         """
         logger.info(f"Finding optimal views for query: '{query}'")
 
-        # Step 1: Semantic search for relevant views
-        semantic_results = self.semantic_search.suggest_views_for_query(
+        # Embed the query once; the same text is an LRU hit inside the
+        # semantic search, so nothing is encoded twice
+        cache_key = (
+            frozenset(terminal_tables),
+            self.schema_graph.version,
+            self.catalog.version
+        )
+        query_embedding = self.semantic_search.embed_text(query)
+        unit_query = query_embedding / (np.linalg.norm(query_embedding) or 1.0)
+
+        entries = self._semantic_cache.get(cache_key)
+        if entries:
+            # One matvec over the cached embeddings finds the closest
+            # previously answered query for this terminal set
+            similarities = np.vstack([emb for emb, _ in entries]) @ unit_query
+            best = int(np.argmax(similarities))
+            if float(similarities[best]) >= self._semantic_threshold:
+                self._semantic_cache.move_to_end(cache_key)
+                logger.debug("Semantic cache hit for query: '%s'", query)
+                return dict(entries[best][1])
+
+        # Steps 1 and 2 are independent: run the semantic search on the
+        # shared pool while the Steiner recommendation runs here
+        semantic_future = self._executor.submit(
+            self.semantic_search.suggest_views_for_query,
             query,
             tables=terminal_tables,
             top_k=5
         )
-
-        # Step 2: Get Steiner Tree recommendations
         steiner_recommendations = self.steiner_solver.recommend_views(
             terminal_tables,
             top_k=5
         )
+        semantic_results = semantic_future.result()
 
         # Step 3: Combine recommendations (union of both approaches)
         all_recommended = {}
@@ -84,9 +143,10 @@ class ViewIntegration:
             }
 
         for view in steiner_recommendations:
-            if view.view_name in all_recommended:
-                all_recommended[view.view_name]['steiner_score'] = 1
-                all_recommended[view.view_name]['source'] = 'both'
+            entry = all_recommended.get(view.view_name)
+            if entry is not None:
+                entry['steiner_score'] = 1
+                entry['source'] = 'both'
             else:
                 all_recommended[view.view_name] = {
                     'view': view,
@@ -95,31 +155,37 @@ class ViewIntegration:
                     'source': 'steiner'
                 }
 
-        # Step 4: Calculate combined scores
-        ranked_views = []
-        for view_name, data in all_recommended.items():
-            # Combined score: semantic + steiner + usage bonus
-            combined_score = (
-                data['semantic_score'] * 0.5 +
-                data['steiner_score'] * 0.3 +
-                (data['view'].usage_count / 100) * 0.2  # Usage bonus
-            )
-
-            ranked_views.append({
-                'view': data['view'],
-                'combined_score': combined_score,
-                'semantic_score': data['semantic_score'],
-                'steiner_score': data['steiner_score'],
-                'source': data['source']
-            })
-
-        # Sort by combined score
-        ranked_views.sort(key=lambda x: x['combined_score'], reverse=True)
+        # Step 4: Calculate combined scores in one vector op
+        # (semantic + steiner + usage bonus) instead of a Python
+        # arithmetic loop and a lambda-keyed sort
+        candidates = list(all_recommended.values())
+        n = len(candidates)
+        semantic = np.fromiter(
+            (c['semantic_score'] for c in candidates), dtype=np.float32, count=n
+        )
+        steiner = np.fromiter(
+            (c['steiner_score'] for c in candidates), dtype=np.float32, count=n
+        )
+        usage = np.fromiter(
+            (c['view'].usage_count for c in candidates), dtype=np.float32, count=n
+        )
+        combined = semantic * _SEM_W + steiner * _ST_W + usage * _USAGE_W
+
+        ranked_views = [
+            {
+                'view': candidates[i]['view'],
+                'combined_score': float(combined[i]),
+                'semantic_score': candidates[i]['semantic_score'],
+                'steiner_score': candidates[i]['steiner_score'],
+                'source': candidates[i]['source']
+            }
+            for i in np.argsort(-combined)
+        ]
 
         # Step 5: Get Steiner Tree comparison
         comparison = self.steiner_solver.compare_solutions(terminal_tables)
 
-        return {
+        result = {
             'recommended_views': ranked_views[:3],  # Top 3
             'all_candidates': ranked_views,
             'steiner_comparison': comparison,
@@ -127,6 +193,48 @@ class ViewIntegration:
             'query': query
         }
 
+        entries = self._semantic_cache.setdefault(cache_key, [])
+        entries.append((unit_query, result))
+        if len(entries) > self._semantic_entries_per_key:
+            del entries[0]
+        self._semantic_cache.move_to_end(cache_key)
+        while len(self._semantic_cache) > self._semantic_cache_size:
+            self._semantic_cache.popitem(last=False)
+
+        return result
+
+    def find_optimal_views_batch(
+        self,
+        queries: List[str],
+        terminals: List[List[str]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Find optimal views for a batch of queries.
+
+        All query embeddings are encoded in one batched model call up
+        front; the per-query work then runs against warm caches, so
+        repeated terminal sets reuse the solver's cached comparisons
+        and near-duplicate queries hit the semantic result cache.
+
+        Args:
+            queries: Natural language queries
+            terminals: Required tables per query (parallel to queries)
+
+        Returns:
+            List of find_optimal_views result dicts, in input order
+        """
+        if len(queries) != len(terminals):
+            raise ValueError("queries and terminals must have the same length")
+
+        # One batched encode fills the query-embedding cache; the
+        # embed_text calls inside find_optimal_views all hit it
+        self.semantic_search.embed_texts(queries)
+
+        return [
+            self.find_optimal_views(query, terminal_tables)
+            for query, terminal_tables in zip(queries, terminals)
+        ]
+
     def should_create_view(
         self,
         query: str,
@@ -167,8 +275,10 @@ class ViewIntegration:
                     'confidence': best_view['combined_score']
                 }
 
-        # Check Steiner Tree complexity
-        steiner_solution = self.steiner_solver.solve(terminal_tables, use_views=False)
+        # Check Steiner Tree complexity. find_optimal_views already solved
+        # without views as part of its comparison, so reuse that solution
+        # instead of running the solver a second time.
+        steiner_solution = optimal_views['steiner_comparison']['solution_without']
 
         # Create view if:
         # 1. Multiple tables involved
@@ -211,15 +321,44 @@ class ViewIntegration:
 
         view_name = '_'.join(parts)
 
-        # Ensure uniqueness
-        counter = 1
-        original_name = view_name
+        # Repeat suggestions for the same base skip the catalog probe
+        # entirely; suggested names are assumed consumed, so the memo
+        # just hands out the next suffix
+        counter = self._name_counters.get(view_name)
+        if counter is not None:
+            self._name_counters[view_name] = counter + 1
+            return f"{view_name}_{counter}"
+
+        # Ensure uniqueness: one prefix query collects every existing
+        # variant, then the next suffix is max(existing) + 1. Gaps in
+        # the suffix sequence are deliberately not reused -- the memo
+        # only tracks a high-water mark, so a gap-filling suggestion
+        # would let later increments collide with existing names
+        existing = self.catalog.find_names_with_prefix(view_name)
+        if not existing:
+            self._name_counters[view_name] = 1
+            return view_name
+
+        suffix_re = re.compile(rf'{re.escape(view_name)}(?:_(\d+))?\Z')
+        base_taken = False
+        taken_suffixes = set()
+        for name in existing:
+            match = suffix_re.match(name)
+            if match is None:
+                continue
+            if match.group(1) is None:
+                base_taken = True
+            else:
+                taken_suffixes.add(int(match.group(1)))
+
+        next_suffix = max(taken_suffixes, default=0) + 1
 
-        while self.catalog.find_by_name(view_name):
-            view_name = f"{original_name}_{counter}"
-            counter += 1
+        if not base_taken:
+            self._name_counters[view_name] = next_suffix
+            return view_name
 
-        return view_name
+        self._name_counters[view_name] = next_suffix + 1
+        return f"{view_name}_{next_suffix}"
 
     def get_view_impact_analysis(self, view_name: str) -> Dict[str, Any]:
         """
@@ -239,24 +378,22 @@ class ViewIntegration:
         # Get view lineage
         lineage = self.catalog.get_view_lineage(view_name)
 
-        # Find queries that could use this view
-        # (queries that need any of the view's base tables)
-        potential_queries = []
-
-        # Get all views that could benefit from this view
-        for candidate in self.catalog.get_all_views():
-            if candidate.view_name == view_name:
-                continue
-
-            # Check if candidate uses any of this view's tables
-            overlap = set(candidate.base_tables) & set(view.base_tables)
-
-            if overlap:
-                potential_queries.append({
-                    'view': candidate.view_name,
-                    'tables_overlap': list(overlap),
-                    'potential_savings': len(overlap)
-                })
+        # Find queries that could use this view (views sharing any of
+        # its base tables). The overlap is computed inside the catalog
+        # database, already sorted by overlap size, so no per-candidate
+        # Python work remains here.
+        overlapping = self.catalog.find_views_touching_tables(
+            view.base_tables,
+            exclude=view_name
+        )
+        potential_queries = [
+            {
+                'view': candidate_name,
+                'tables_overlap': overlap,
+                'potential_savings': len(overlap)
+            }
+            for candidate_name, overlap in overlapping
+        ]
 
         return {
             'view': view,
@@ -268,12 +405,34 @@ class ViewIntegration:
             'recommendations': potential_queries[:5]  # Top 5
         }
 
-    def refresh_view_graph_cache(self):
+    def refresh_view_graph_cache(self, action: Optional[str] = None, view=None):
         """
-        Refresh the cached unified graph with latest views.
-        Call this after creating/deleting views.
+        Refresh the cached unified graph and semantic index with the
+        latest views. Call this after creating/deleting views.
+
+        Args:
+            action: 'add' or 'remove' to patch the cached unified graph
+                incrementally for a single view; anything else (or None)
+                falls back to a full rebuild on the next solve
+            view: ViewMetadata for 'add', view name (str) for 'remove'
         """
-        self.steiner_solver.unified_graph = None
+        if action == 'add' and view is not None:
+            self.steiner_solver.add_view(view)
+        elif action == 'remove' and view is not None:
+            self.steiner_solver.remove_view(
+                view if isinstance(view, str) else view.view_name
+            )
+        else:
+            self.steiner_solver.unified_graph = None
+        self.steiner_solver._compare_cache.clear()
+        self._semantic_cache.clear()
+
+        # Re-embed the catalog eagerly so the scoring matrix is rebuilt
+        # here, off the query path, rather than on the next search.
+        # Unchanged views are content-hash cache hits, so only new or
+        # edited views actually encode.
+        self.semantic_search.index_all_views()
+
         logger.info("View graph cache refreshed")
 
     def print_optimization_report(
@@ -288,62 +447,67 @@ class ViewIntegration:
             query: Natural language query
             terminal_tables: Required tables
         """
-        print("\n" + "="*70)
-        print("View Optimization Report")
-        print("="*70)
-
-        print(f"\nQuery: {query}")
-        print(f"Required Tables: {', '.join(terminal_tables)}")
+        # Accumulate the report and print once: one flush/syscall
+        # instead of ~30, which matters when stdout is piped
+        parts = [
+            "\n" + _BANNER,
+            "View Optimization Report",
+            _BANNER,
+            f"\nQuery: {query}",
+            f"Required Tables: {', '.join(terminal_tables)}",
+        ]
 
         # Find optimal views
         optimal = self.find_optimal_views(query, terminal_tables)
 
-        print("\n" + "-"*70)
-        print("Recommended Views:")
-        print("-"*70)
+        parts += ["\n" + _RULE, "Recommended Views:", _RULE]
 
         if optimal['recommended_views']:
             for i, rec in enumerate(optimal['recommended_views'], 1):
                 view = rec['view']
-                print(f"\n{i}. {view.view_name}")
-                print(f"   Layer: {view.layer} | Domain: {view.domain}")
-                print(f"   Score: {rec['combined_score']:.3f} (semantic: {rec['semantic_score']:.3f}, steiner: {rec['steiner_score']:.3f})")
-                print(f"   Usage: {view.usage_count} times")
-                print(f"   Base Tables: {', '.join(view.base_tables)}")
+                parts += [
+                    f"\n{i}. {view.view_name}",
+                    f"   Layer: {view.layer} | Domain: {view.domain}",
+                    f"   Score: {rec['combined_score']:.3f} (semantic: {rec['semantic_score']:.3f}, steiner: {rec['steiner_score']:.3f})",
+                    f"   Usage: {view.usage_count} times",
+                    f"   Base Tables: {', '.join(view.base_tables)}",
+                ]
         else:
-            print("  No existing views found - consider creating one!")
+            parts.append("  No existing views found - consider creating one!")
 
         # Steiner Tree comparison
-        print("\n" + "-"*70)
-        print("Steiner Tree Optimization:")
-        print("-"*70)
+        parts += ["\n" + _RULE, "Steiner Tree Optimization:", _RULE]
 
         comparison = optimal['steiner_comparison']
 
-        print(f"\nWithout Views:")
-        print(f"  Tables: {', '.join(comparison['without_views']['tables'])}")
-        print(f"  Cost: {comparison['without_views']['cost']:.4f}")
-
-        print(f"\nWith Views:")
-        print(f"  Tables: {', '.join(comparison['with_views']['tables'])}")
+        parts += [
+            "\nWithout Views:",
+            f"  Tables: {', '.join(comparison['without_views']['tables'])}",
+            f"  Cost: {comparison['without_views']['cost']:.4f}",
+            "\nWith Views:",
+            f"  Tables: {', '.join(comparison['with_views']['tables'])}",
+        ]
         if comparison['with_views']['views']:
-            print(f"  Views: {', '.join(comparison['with_views']['views'])}")
-        print(f"  Cost: {comparison['with_views']['cost']:.4f}")
+            parts.append(f"  Views: {', '.join(comparison['with_views']['views'])}")
+        parts.append(f"  Cost: {comparison['with_views']['cost']:.4f}")
 
         savings = comparison['savings']
-        print(f"\nSavings:")
-        print(f"  Cost Reduction: {savings['cost_reduction']:.4f} ({savings['cost_reduction_pct']:.1f}%)")
-        print(f"  Tables Avoided: {savings['tables_avoided']}")
+        parts += [
+            "\nSavings:",
+            f"  Cost Reduction: {savings['cost_reduction']:.4f} ({savings['cost_reduction_pct']:.1f}%)",
+            f"  Tables Avoided: {savings['tables_avoided']}",
+        ]
 
         # Creation recommendation
-        print("\n" + "-"*70)
-        print("View Creation Recommendation:")
-        print("-"*70)
+        parts += ["\n" + _RULE, "View Creation Recommendation:", _RULE]
 
         recommendation = self.should_create_view(query, terminal_tables)
 
-        print(f"\nShould Create: {recommendation['should_create']}")
-        print(f"Reason: {recommendation['reason']}")
-        print(f"Confidence: {recommendation.get('confidence', 0):.2f}")
+        parts += [
+            f"\nShould Create: {recommendation['should_create']}",
+            f"Reason: {recommendation['reason']}",
+            f"Confidence: {recommendation.get('confidence', 0):.2f}",
+            "\n" + _BANNER + "\n",
+        ]
 
-        print("\n" + "="*70 + "\n")
+        print("\n".join(parts))
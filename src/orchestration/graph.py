@@ -3,16 +3,17 @@ LangGraph workflow for multi-agent research orchestration.
 Defines the StateGraph with Explorer → Researcher → Report flow.
 """
 
+import functools
 import logging
 from datetime import datetime
 from typing import Dict, Any
-from langgraph.graph import StateGraph, END
 
-from .state import ResearchState, create_initial_state, format_state_summary
+from .state import ResearchState, LazyStateSummary, create_initial_state
 from .router import should_explore, should_continue_research, log_routing_decision
-from ..agents.explorer_agent import ExplorerAgent
-from ..agents.researcher_agent import ResearcherAgent
-from ..database.connection import get_db
+
+# langgraph, the agents, and the database connection are imported lazily
+# inside the functions that need them: importing this module (e.g. for
+# the state helpers) should not pay for model/SDK imports up front.
 
 logger = logging.getLogger(__name__)
 
@@ -52,8 +53,12 @@ def explore_node(state: ResearchState) -> ResearchState:
     state['current_step'] = "EXPLORE"
 
     try:
-        # Initialize Explorer
-        db = get_db()
+        # Initialize Explorer (db resolved once by run_research_workflow;
+        # fall back to the singleton for direct node invocation)
+        from ..agents.explorer_agent import ExplorerAgent
+        from ..database.connection import get_db
+
+        db = state.get('db') or get_db()
         explorer = ExplorerAgent(db=db, role=state['user_role'])
         logger.info(f"Explorer initialized for role: {state['user_role']}")
 
@@ -62,32 +67,37 @@ def explore_node(state: ResearchState) -> ResearchState:
         result = explorer.process(state['user_query'])
         logger.info(f"Explorer process returned: success={result.get('success')}")
 
-        # Update state
-        state['explorer_result'] = result
+        # Update state (flat keys instead of nesting the whole result)
+        state['explorer_success'] = bool(result['success'])
 
         if result['success']:
-            # Extract context
+            # Extract context (lazy %-formatting: the keys are only
+            # stringified if the record is actually emitted)
             context = result.get('context', {})
-            logger.info(f"Context keys: {list(context.keys())}")
+            state['explorer_context'] = context
+            logger.info("Context keys: %s", context.keys())
 
             # Accumulate tables and views
             if 'relevant_tables' in context:
-                state['relevant_tables'] = context['relevant_tables']
-                logger.info(f"Relevant tables: {context['relevant_tables']}")
+                state['relevant_tables'] = dict.fromkeys(context['relevant_tables'])
+                state['n_tables'] = len(state['relevant_tables'])
+                logger.info("Relevant tables: %s", context['relevant_tables'])
 
             if 'existing_views' in context:
-                state['existing_views'] = context['existing_views']
-                logger.info(f"Existing views found: {len(context['existing_views'])}")
+                state['existing_views'] = dict.fromkeys(context['existing_views'])
+                logger.info("Existing views found: %d", len(context['existing_views']))
 
             if 'created_views' in context:
                 # Add created view names
                 created_view_names = [v.view_name for v in result.get('created_views', [])]
-                state['views_created'] = created_view_names
-                logger.info(f"Views created by Explorer: {created_view_names}")
+                state['views_created'] = dict.fromkeys(created_view_names)
+                state['n_views_created'] = len(state['views_created'])
+                logger.info("Views created by Explorer: %s", created_view_names)
 
             logger.info(
-                f"Explorer complete: {len(state.get('views_created', []))} views created, "
-                f"{len(state.get('existing_views', []))} views found"
+                "Explorer complete: %d views created, %d views found",
+                len(state.get('views_created', {})),
+                len(state.get('existing_views', {}))
             )
         else:
             state['error'] = f"Explorer failed: {result.get('message', 'Unknown error')}"
@@ -118,45 +128,51 @@ def research_node(state: ResearchState) -> ResearchState:
     state['current_step'] = "RESEARCH"
 
     try:
-        # Initialize Researcher
-        db = get_db()
+        # Initialize Researcher (db handle carried in state)
+        from ..agents.researcher_agent import ResearcherAgent
+        from ..database.connection import get_db
+
+        db = state.get('db') or get_db()
         researcher = ResearcherAgent(db=db, role=state['user_role'])
         logger.info(f"Researcher initialized for role: {state['user_role']}")
 
         # Build context from Explorer (if available)
-        context = None
-        if state.get('explorer_result'):
-            context = state['explorer_result'].get('context')
-            logger.info(f"Using Explorer context with keys: {list(context.keys()) if context else 'None'}")
+        context = state.get('explorer_context')
+        if context is not None:
+            logger.info("Using Explorer context with keys: %s", context.keys())
 
         # Process query
         logger.info(f"Processing query: {state['user_query']}")
         result = researcher.process(state['user_query'], context=context)
         logger.info(f"Researcher process returned: success={result.get('success')}")
 
-        # Update state
-        state['researcher_result'] = result
+        # Update state (flat keys instead of nesting the whole result)
+        state['researcher_success'] = bool(result['success'])
+        state['researcher_report'] = result.get('report', '')
 
         if result['success']:
             # Accumulate query results
             if 'query_results' in result:
                 state['query_results'] = result['query_results']
-                logger.info(f"Query results count: {len(result['query_results'])}")
+                state['n_queries'] = len(state['query_results'])
+                logger.info("Query results count: %d", len(result['query_results']))
 
             # Accumulate created views
             if 'created_views' in result:
                 created_view_names = [v.view_name for v in result.get('created_views', [])]
-                logger.info(f"Views created by Researcher: {created_view_names}")
-                logger.info(f"Current views_created list before extend: {state.get('views_created', [])}")
-                state['views_created'].extend(created_view_names)
-                logger.info(f"Current views_created list after extend: {state['views_created']}")
+                logger.info("Views created by Researcher: %s", created_view_names)
+                logger.info("Current views_created before update: %s", state.get('views_created', {}).keys())
+                state['views_created'].update(dict.fromkeys(created_view_names))
+                state['n_views_created'] = len(state['views_created'])
+                logger.info("Current views_created after update: %s", state['views_created'].keys())
 
             # Store analysis
             state['analysis'] = result.get('analysis', '')
 
             logger.info(
-                f"Researcher complete: {len(result.get('query_results', []))} queries executed, "
-                f"{len(result.get('created_views', []))} views created"
+                "Researcher complete: %d queries executed, %d views created",
+                len(result.get('query_results', [])),
+                len(result.get('created_views', []))
             )
         else:
             state['error'] = f"Researcher failed: {result.get('message', 'Unknown error')}"
@@ -200,22 +216,22 @@ def report_node(state: ResearchState) -> ResearchState:
             report_sections.append("Partial results below:\n")
 
         # Explorer findings
-        if state.get('explorer_result'):
+        if state.get('explorer_success') is not None:
             report_sections.append("\n## EXPLORATION PHASE")
             report_sections.append("-" * 80)
 
-            relevant_tables = state.get('relevant_tables', [])
+            relevant_tables = state.get('relevant_tables', {})
             if relevant_tables:
                 report_sections.append(f"\nRelevant Tables: {', '.join(relevant_tables)}")
 
-            existing_views = state.get('existing_views', [])
+            existing_views = state.get('existing_views', {})
             if existing_views:
                 report_sections.append(f"Existing Views Found: {len(existing_views)}")
-                for view_name in existing_views[:5]:  # Show first 5
+                for view_name in list(existing_views)[:5]:  # Show first 5
                     report_sections.append(f"  - {view_name}")
 
         # Researcher findings
-        if state.get('researcher_result'):
+        if state.get('researcher_success') is not None:
             report_sections.append("\n\n## ANALYSIS PHASE")
             report_sections.append("-" * 80)
 
@@ -236,16 +252,19 @@ def report_node(state: ResearchState) -> ResearchState:
                     # Show sample data from results
                     if qr.get('results') and len(qr['results']) > 0:
                         sample = qr['results'][0]  # First row
-                        report_sections.append(f"    Sample: {dict(sample)}")
+                        # Format straight from the row (sqlite3.Row and
+                        # dict both expose keys()/[]), skipping the
+                        # intermediate dict copy
+                        pairs = ", ".join(f"{k!r}: {sample[k]!r}" for k in sample.keys())
+                        report_sections.append(f"    Sample: {{{pairs}}}")
 
         # Views created
-        views_created = state.get('views_created', [])
-        logger.info(f"REPORT: views_created list = {views_created}")
-        logger.info(f"REPORT: Unique views = {list(set(views_created)) if views_created else []}")
+        views_created = state.get('views_created', {})
+        logger.info("REPORT: views_created = %s", views_created.keys())
 
         if views_created:
-            # Deduplicate views for display
-            unique_views = list(dict.fromkeys(views_created))  # Preserves order
+            # Already deduplicated: views_created is a dict-backed ordered set
+            unique_views = list(views_created)
             report_sections.append("\n\n## VIEWS CREATED")
             report_sections.append("-" * 80)
             report_sections.append(f"\nTotal Views: {len(unique_views)}")
@@ -253,8 +272,8 @@ def report_node(state: ResearchState) -> ResearchState:
                 report_sections.append(f"  ✓ {view_name}")
 
         # Final report from researcher
-        if state.get('researcher_result'):
-            researcher_report = state['researcher_result'].get('report', '')
+        if state.get('researcher_success') is not None:
+            researcher_report = state.get('researcher_report', '')
             if researcher_report:
                 report_sections.append("\n\n## FINDINGS")
                 report_sections.append("-" * 80)
@@ -283,13 +302,15 @@ def report_node(state: ResearchState) -> ResearchState:
     return state
 
 
-def build_research_graph() -> StateGraph:
+def build_research_graph() -> "StateGraph":
     """
     Build the LangGraph StateGraph for research workflow.
 
     Returns:
         Compiled StateGraph
     """
+    from langgraph.graph import StateGraph, END
+
     logger.info("Building research workflow graph...")
 
     # Create graph
@@ -325,6 +346,21 @@ def build_research_graph() -> StateGraph:
     return app
 
 
+@functools.lru_cache(maxsize=1)
+def _get_app():
+    """
+    Compiled research graph, built once per process.
+    The topology is static, so StateGraph construction, validation and
+    compile() are pure overhead on repeat invocations.
+    """
+    return build_research_graph()
+
+
+def rebuild_research_graph() -> None:
+    """Drop the cached compiled graph (call if the topology changes)."""
+    _get_app.cache_clear()
+
+
 def run_research_workflow(
     user_query: str,
     user_role: str = "fraud_analyst",
@@ -346,8 +382,10 @@ def run_research_workflow(
     try:
         # Initialize database connection (ensure singleton is initialized)
         from pathlib import Path
+        from ..database.connection import get_db
+
         db_path = Path(__file__).parent.parent.parent / 'data' / 'researchdb.db'
-        get_db(str(db_path))
+        db = get_db(str(db_path))
 
         # Create initial state
         initial_state = create_initial_state(
@@ -355,21 +393,24 @@ def run_research_workflow(
             user_role=user_role,
             session_id=session_id
         )
+        # Resolve the connection once here instead of per node
+        initial_state['db'] = db
 
-        # Build and run graph
-        app = build_research_graph()
+        # Run the cached compiled graph
+        app = _get_app()
         final_state = app.invoke(initial_state)
 
-        # Log summary
+        # Log summary (formatted only if the record is emitted)
         logger.info("Workflow complete!")
-        logger.info(format_state_summary(final_state))
+        logger.info("%s", LazyStateSummary(final_state))
 
         return {
             'success': not bool(final_state.get('error')),
             'session_id': final_state['session_id'],
             'report': final_state.get('final_report', ''),
-            'views_created': final_state.get('views_created', []),
-            'views_used': final_state.get('existing_views', []),
+            # Write-once, read-at-end: sized exactly, no list over-allocation
+            'views_created': tuple(final_state.get('views_created', ())),
+            'views_used': tuple(final_state.get('existing_views', ())),
             'error': final_state.get('error'),
             'state': final_state
         }
@@ -21,7 +21,7 @@ def should_explore(state: ResearchState) -> Literal["explore", "research"]:
         "explore" to run Explorer, "research" to skip to Researcher
     """
     # Check if we have relevant existing views
-    existing_views = state.get('existing_views', [])
+    existing_views = state.get('existing_views', {})
 
     if existing_views and len(existing_views) >= 2:
         # We have sufficient views, skip exploration
@@ -47,7 +47,7 @@ def should_continue_research(state: ResearchState) -> Literal["report", "end"]:
     """
     # Check if we have results to report
     query_results = state.get('query_results', [])
-    views_created = state.get('views_created', [])
+    views_created = state.get('views_created', {})
 
     if query_results or views_created:
         logger.info("Generating final report")
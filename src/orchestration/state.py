@@ -3,50 +3,130 @@ State management for LangGraph orchestration.
 Defines the ResearchState that flows through the agent workflow.
 """
 
+import itertools
+import os
+import time
+from functools import lru_cache
+
 from typing import TypedDict, List, Dict, Any, Optional
-from typing_extensions import Annotated
-import operator
+from typing_extensions import Annotated, Required
+
+
+def _timestamp() -> str:
+    """
+    ISO-8601 UTC timestamp, formatted straight from time.time().
+
+    Equivalent to datetime.utcnow().isoformat() but skips constructing
+    the intermediate datetime object on the session-start path.
+    """
+    t = time.time()
+    return time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(t)) + f".{int(t % 1 * 1e6):06d}"
+
+# Session-id generation state: a millisecond timestamp prefix plus a
+# per-process counter is unique within a process without drawing OS
+# entropy (uuid4 hits the CSPRNG on every call). The pid is read per
+# call, not at import: a forked worker inherits the counter state, and
+# only the current pid keeps its suffixes distinct from the parent's.
+_counter = itertools.count()
+
+
+def _gen_session_id() -> str:
+    """Monotonic time-prefixed session id (cheaper than uuid4)."""
+    ts = int(time.time() * 1000)
+    n = next(_counter)
+    return f"session_{ts:011x}{(n ^ os.getpid()) & 0xFFFF:04x}"
+
+
+def extend_list(left: List[Any], right: List[Any]) -> List[Any]:
+    """
+    Reducer for accumulated list channels.
+
+    operator.add allocates a new list and copies every element on each
+    merge -- quadratic over a workflow's accumulation steps. Extending
+    the existing list in place keeps each merge O(len(right)).
+    """
+    left.extend(right)
+    return left
+
+
+def merge_names(left: Dict[str, None], right: Dict[str, None]) -> Dict[str, None]:
+    """
+    Reducer for the name-accumulating channels.
+
+    Names are tracked as dict-backed ordered sets (keys only) so that
+    accumulation across nodes deduplicates in O(1) per name while preserving
+    insertion order, and no duplicate strings are retained.
+    """
+    return {**left, **right}
 
 
-class ResearchState(TypedDict):
+class ResearchState(TypedDict, total=False):
     """
     State object for research workflow.
     Flows through: START → EXPLORE → RESEARCH → REPORT → END
+
+    total=False with Required on the three inputs keeps the runtime
+    required-key set at 3 instead of 22; everything else is initialized
+    by create_initial_state but need not be present on every update.
     """
 
     # Input
-    user_query: str
+    user_query: Required[str]
     """User's natural language query"""
 
-    user_role: str
+    user_role: Required[str]
     """User role for security context (e.g., 'fraud_analyst')"""
 
-    session_id: str
+    session_id: Required[str]
     """Unique session identifier"""
 
-    # Explorer output
-    explorer_result: Optional[Dict[str, Any]]
-    """Complete result from Explorer agent"""
+    db: Optional[Any]
+    """Shared database connection, resolved once at workflow start"""
+
+    # Explorer output (flat keys: one hash lookup per read instead of
+    # two through a nested result dict)
+    explorer_success: Optional[bool]
+    """Whether the Explorer run succeeded (None until it runs)"""
 
-    relevant_tables: Annotated[List[str], operator.add]
-    """Tables identified as relevant (accumulated)"""
+    explorer_context: Optional[Dict[str, Any]]
+    """Context the Explorer produced for the Researcher"""
 
-    existing_views: Annotated[List[str], operator.add]
-    """View names that already exist (accumulated)"""
+    relevant_tables: Annotated[Dict[str, None], merge_names]
+    """Tables identified as relevant (ordered set: dict keys)"""
+
+    existing_views: Annotated[Dict[str, None], merge_names]
+    """View names that already exist (ordered set: dict keys)"""
 
     # Researcher output
-    researcher_result: Optional[Dict[str, Any]]
-    """Complete result from Researcher agent"""
+    researcher_success: Optional[bool]
+    """Whether the Researcher run succeeded (None until it runs)"""
+
+    researcher_report: Optional[str]
+    """Findings report text from the Researcher"""
 
-    query_results: Annotated[List[Dict[str, Any]], operator.add]
+    query_results: Annotated[List[Dict[str, Any]], extend_list]
     """Analytical query results (accumulated)"""
 
     # View tracking
-    views_created: Annotated[List[str], operator.add]
-    """View names created during this session (accumulated)"""
+    views_created: Annotated[Dict[str, None], merge_names]
+    """View names created during this session (ordered set: dict keys)"""
 
-    views_used: Annotated[List[str], operator.add]
-    """View names reused from catalog (accumulated)"""
+    views_used: Annotated[Dict[str, None], merge_names]
+    """View names reused from catalog (ordered set: dict keys)"""
+
+    # Aggregate counters, kept in sync by the nodes that write the
+    # containers above so the summary never touches the containers
+    n_tables: int
+    """Running count of relevant_tables"""
+
+    n_views_created: int
+    """Running count of views_created"""
+
+    n_views_used: int
+    """Running count of views_used"""
+
+    n_queries: int
+    """Running count of query_results"""
 
     # Final output
     final_report: Optional[str]
@@ -73,6 +153,80 @@ class ResearchState(TypedDict):
     """Current workflow step for debugging"""
 
 
+# Canonical shape of a fresh state with its constant defaults; the
+# specialized constructor below is generated from it so the schema
+# lives in one place. Accumulator fields are marked None here and
+# emitted as fresh container literals by the codegen.
+_INITIAL_TEMPLATE: Dict[str, Any] = {
+    'user_query': '',
+    'user_role': '',
+    'session_id': '',
+    'db': None,
+    'explorer_success': None,
+    'explorer_context': None,
+    'relevant_tables': None,
+    'existing_views': None,
+    'researcher_success': None,
+    'researcher_report': None,
+    'query_results': None,
+    'views_created': None,
+    'views_used': None,
+    'n_tables': 0,
+    'n_views_created': 0,
+    'n_views_used': 0,
+    'n_queries': 0,
+    'final_report': None,
+    'analysis': None,
+    'skip_exploration': False,
+    'start_time': None,
+    'end_time': None,
+    'error': None,
+    'current_step': 'START',
+}
+
+# Fields whose values vary per session (bound as parameters) and the
+# accumulators that need a fresh container literal per call
+_VAR_FIELDS = ('user_query', 'user_role', 'session_id', 'start_time')
+_CONTAINER_FIELDS = {
+    'relevant_tables': '{}',
+    'existing_views': '{}',
+    'query_results': '[]',
+    'views_created': '{}',
+    'views_used': '{}',
+}
+
+
+def _compile_builder():
+    """
+    Compile a specialized state constructor from the template.
+
+    The generated function returns a single dict literal with every
+    schema key inlined, so CPython builds the state in one BUILD_MAP
+    sweep -- faster than binding 22 keyword arguments or copying a
+    template and overwriting the variable fields, and the container
+    literals give each session fresh accumulators for free.
+    """
+    items = []
+    for key, default in _INITIAL_TEMPLATE.items():
+        if key in _VAR_FIELDS:
+            items.append(f"{key!r}: {key}")
+        elif key in _CONTAINER_FIELDS:
+            items.append(f"{key!r}: {_CONTAINER_FIELDS[key]}")
+        else:
+            items.append(f"{key!r}: {default!r}")
+
+    src = (
+        "def _build(user_query, user_role, session_id, start_time):\n"
+        "    return {" + ", ".join(items) + "}\n"
+    )
+    namespace: Dict[str, Any] = {}
+    exec(compile(src, '<state-builder>', 'exec'), namespace)
+    return namespace['_build']
+
+
+_build = _compile_builder()
+
+
 def create_initial_state(
     user_query: str,
     user_role: str = "analyst",
@@ -89,43 +243,11 @@ def create_initial_state(
     Returns:
         Initial ResearchState object
     """
-    import uuid
-    from datetime import datetime
-
-    if not session_id:
-        session_id = f"session_{uuid.uuid4().hex[:8]}"
-
-    return ResearchState(
-        # Input
-        user_query=user_query,
-        user_role=user_role,
-        session_id=session_id,
-
-        # Explorer output
-        explorer_result=None,
-        relevant_tables=[],
-        existing_views=[],
-
-        # Researcher output
-        researcher_result=None,
-        query_results=[],
-
-        # View tracking
-        views_created=[],
-        views_used=[],
-
-        # Final output
-        final_report=None,
-        analysis=None,
-
-        # Workflow control
-        skip_exploration=False,
-
-        # Metadata
-        start_time=datetime.utcnow().isoformat(),
-        end_time=None,
-        error=None,
-        current_step="START"
+    return _build(
+        user_query,
+        user_role,
+        session_id or _gen_session_id(),
+        _timestamp()
     )
 
 
@@ -139,13 +261,13 @@ def validate_state(state: ResearchState) -> bool:
     Returns:
         True if valid, False otherwise
     """
-    required_fields = ['user_query', 'user_role', 'session_id']
-
-    for field in required_fields:
-        if field not in state or not state[field]:
-            return False
-
-    return True
+    # Fixed three-field schema, unrolled: one short-circuited
+    # expression, no list build or loop setup per call
+    return bool(
+        state.get('user_query')
+        and state.get('user_role')
+        and state.get('session_id')
+    )
 
 
 def format_state_summary(state: ResearchState) -> str:
@@ -158,22 +280,72 @@ def format_state_summary(state: ResearchState) -> str:
     Returns:
         Formatted summary string
     """
-    lines = [
-        f"Session: {state['session_id']}",
-        f"Query: {state['user_query']}",
-        f"Role: {state['user_role']}",
-        f"Step: {state['current_step']}",
-        "",
-        f"Tables: {len(state.get('relevant_tables', []))}",
-        f"Views Created: {len(state.get('views_created', []))}",
-        f"Views Used: {len(state.get('views_used', []))}",
-        f"Queries Executed: {len(state.get('query_results', []))}",
-    ]
-
-    if state.get('error'):
-        lines.append(f"Error: {state['error']}")
-
-    if state.get('final_report'):
-        lines.append(f"Report: {len(state['final_report'])} chars")
-
-    return "\n".join(lines)
+    # The state is mutable, but the summary depends only on these
+    # scalars; extract them and let the cached renderer skip
+    # re-formatting identical content on repeated transitions. The
+    # counts come from the running counters the nodes maintain, so the
+    # containers themselves are never touched here.
+    final_report = state.get('final_report')
+    return _render_summary(
+        state['session_id'],
+        state['user_query'],
+        state['user_role'],
+        state['current_step'],
+        state.get('n_tables', 0),
+        state.get('n_views_created', 0),
+        state.get('n_views_used', 0),
+        state.get('n_queries', 0),
+        state.get('error'),
+        len(final_report) if final_report else None,
+    )
+
+
+class LazyStateSummary:
+    """
+    Defers format_state_summary until str() is invoked.
+
+    Pass an instance as a %-style logging argument: the logging module
+    only stringifies arguments when a handler actually emits the
+    record, so a disabled level costs one tiny object and nothing more.
+    """
+
+    __slots__ = ('_state',)
+
+    def __init__(self, state: ResearchState):
+        self._state = state
+
+    def __str__(self) -> str:
+        return format_state_summary(self._state)
+
+
+@lru_cache(maxsize=128)
+def _render_summary(
+    session_id: str,
+    user_query: str,
+    user_role: str,
+    step: str,
+    n_tables: int,
+    n_created: int,
+    n_used: int,
+    n_queries: int,
+    error: Optional[str],
+    report_len: Optional[int],
+) -> str:
+    """Format the summary from immutable scalars (memoized)."""
+    # One f-string instead of a lines list + join: no intermediate list
+    # or re-scan to size the result
+    error_line = f"\nError: {error}" if error else ""
+    report_line = f"\nReport: {report_len} chars" if report_len is not None else ""
+
+    return (
+        f"Session: {session_id}\n"
+        f"Query: {user_query}\n"
+        f"Role: {user_role}\n"
+        f"Step: {step}\n"
+        f"\n"
+        f"Tables: {n_tables}\n"
+        f"Views Created: {n_created}\n"
+        f"Views Used: {n_used}\n"
+        f"Queries Executed: {n_queries}"
+        f"{error_line}{report_line}"
+    )